@@ -4,28 +4,81 @@ Main Streamlit application with Snowflake Cortex AI integration
 """
 
 import streamlit as st
+import string
 import time
 import uuid
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from utils.models import initialize_session_state
+from utils.models import initialize_session_state, add_tasks, set_task_status, STATUS_CODES
 from utils.snowflake_client import get_snowflake_client
-from utils.ui_components import show_connection_status, show_ai_badge
+from utils.ui_components import show_connection_status, show_ai_badge, show_metric_tiles, focus_timer_component
+
+
+# Priority buckets: below 40 is Low, 40-70 is Medium, above 70 is High
+PRIORITY_LEVELS = (
+    ("🟢", "Low", "#6bcf7f"),
+    ("🟡", "Medium", "#ffd93d"),
+    ("🔴", "High", "#ff6b6b")
+)
+
+# Status badge colors
+STATUS_COLORS = {
+    "pending": "#95a5a6",
+    "in_progress": "#3498db",
+    "completed": "#2ecc71"
+}
+DEFAULT_STATUS_COLOR = "#95a5a6"
+
+# Number of task cards shown per page of the Tasks grid (and per Journal batch)
+TASK_PAGE_SIZE = 20
+
+# Status filter labels mapped to task statuses
+STATUS_FILTERS = {"Pending": "pending", "In Progress": "in_progress", "Completed": "completed"}
+
+# Task grid wrapper, two cards per row
+GRID_OPEN = '<div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px; margin-bottom: 15px;">'
+
+# Task grid card HTML, compiled once (kept on one line so markdown does not treat it as code)
+CARD_TPL = string.Template(
+    '<div style="border-left: 4px solid $border_color; padding: 15px; background-color: #f8f9fa; '
+    'border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">'
+    '<h4 style="margin: 0 0 10px 0;">$priority_emoji $title</h4>'
+    '<p style="color: #666; font-size: 14px; margin: 5px 0; display: -webkit-box; '
+    '-webkit-line-clamp: 2; -webkit-box-orient: vertical; overflow: hidden;">$description</p>'
+    '<div style="display: flex; gap: 20px; align-items: center; font-size: 14px; margin: 10px 0;">'
+    '<span>⏱️ <b>$duration min</b></span>'
+    '<span><b>Priority:</b> $priority</span>'
+    "<span style='background-color: $status_color; color: white; padding: 2px 8px; border-radius: 10px; font-size: 12px;'>"
+    '$status_label</span>'
+    '</div>'
+    '<details><summary>📋 View Subtasks</summary><ol>$subtasks</ol></details>'
+    '</div>'
+)
+
+
+def priority_level(score):
+    """Get the (emoji, label, color) bucket for a priority score"""
+    return PRIORITY_LEVELS[(score >= 40) + (score > 70)]
+
+
+def format_minutes(minutes):
+    """Format a number of minutes as 'Xh Ym', or 'Ym' under an hour"""
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m"
 
 
 def display_task_card(task):
     """Display a task in an expandable card format"""
+    # Rerun on toggle so the body is only built while the card is open
+    expander = st.expander(f"**{task.title}**", expanded=False, key=f"task_card_{task.id}", on_change="rerun")
+    if not expander.open:
+        return
+    
     # Determine priority color
-    if task.priority_score > 70:
-        priority_color = "🔴"
-        priority_label = "High"
-    elif task.priority_score >= 40:
-        priority_color = "🟡"
-        priority_label = "Medium"
-    else:
-        priority_color = "🟢"
-        priority_label = "Low"
+    priority_color, priority_label, _ = priority_level(task.priority_score)
     
-    with st.expander(f"**{task.title}**", expanded=False):
+    with expander:
         st.write(f"**Description:** {task.description}")
         
         col1, col2 = st.columns(2)
@@ -35,79 +88,55 @@ def display_task_card(task):
             st.markdown(f"{priority_color} **Priority:** `{priority_label} ({task.priority_score:.1f})`")
         
         st.write("**Subtasks:**")
-        for i, subtask in enumerate(task.subtasks, 1):
-            st.write(f"{i}. {subtask}")
-
-
-def display_task_grid_card(task, index):
-    """Display a task card in the grid layout"""
-    # Determine priority emoji and color
-    if task.priority_score > 70:
-        priority_emoji = "🔴"
-        priority_label = "High"
-        border_color = "#ff6b6b"
-    elif task.priority_score >= 40:
-        priority_emoji = "🟡"
-        priority_label = "Medium"
-        border_color = "#ffd93d"
-    else:
-        priority_emoji = "🟢"
-        priority_label = "Low"
-        border_color = "#6bcf7f"
-    
-    # Status badge color
-    status_colors = {
-        "pending": "#95a5a6",
-        "in_progress": "#3498db",
-        "completed": "#2ecc71"
-    }
-    status_color = status_colors.get(task.status, "#95a5a6")
-    
-    # Truncate description
-    description = task.description
-    if len(description) > 100:
-        description = description[:100] + "..."
-    
-    # Create card with custom styling
-    with st.container():
+        # One client-side checklist instead of an element per subtask
         st.markdown(
-            f"""
-            <div style="
-                border-left: 4px solid {border_color};
-                padding: 15px;
-                margin-bottom: 15px;
-                background-color: #f8f9fa;
-                border-radius: 5px;
-                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            ">
-                <h4 style="margin: 0 0 10px 0;">{priority_emoji} {task.title}</h4>
-                <p style="color: #666; font-size: 14px; margin: 5px 0;">{description}</p>
-            </div>
-            """,
+            "".join(f"<label><input type='checkbox'> {subtask}</label><br>" for subtask in task._subtasks_html),
             unsafe_allow_html=True
         )
-        
-        # Metrics row
-        col1, col2, col3 = st.columns([2, 2, 2])
-        with col1:
-            st.markdown(f"⏱️ **{task.estimated_duration} min**")
-        with col2:
-            st.markdown(f"**Priority:** {task.priority_score:.0f}")
-        with col3:
-            st.markdown(
-                f"<span style='background-color: {status_color}; color: white; padding: 2px 8px; border-radius: 10px; font-size: 12px;'>{task.status.replace('_', ' ').title()}</span>",
-                unsafe_allow_html=True
-            )
-        
-        # Subtasks expander
-        with st.expander("📋 View Subtasks"):
-            for i, subtask in enumerate(task.subtasks, 1):
-                st.checkbox(subtask, key=f"subtask_{task.id}_{i}")
-        
-        # Start button
-        if task.status != "completed":
+
+
+def _card_html(task):
+    """Render the HTML for one task card from its pre-escaped text"""
+    # Determine priority emoji and color
+    priority_emoji, _, border_color = priority_level(task.priority_score)
+    
+    return CARD_TPL.substitute(
+        border_color=border_color,
+        priority_emoji=priority_emoji,
+        title=task._title_html,
+        description=task._desc_html,  # Clamped to two lines by the card CSS
+        duration=task.estimated_duration,
+        priority=f"{task.priority_score:.0f}",
+        status_color=STATUS_COLORS.get(task.status, DEFAULT_STATUS_COLOR),
+        status_label=task.status.replace('_', ' ').title(),
+        subtasks="".join(f"<li>{subtask}</li>" for subtask in task._subtasks_html)
+    )
+
+
+def render_cards_html(tasks):
+    """Build the HTML for the whole task grid in a single pass"""
+    parts = [GRID_OPEN]
+    for task in tasks:
+        # Cards are rendered once and kept on the task until its status changes
+        if task.card_html is None:
+            task.card_html = _card_html(task)
+        parts.append(task.card_html)
+    parts.append('</div>')
+    
+    return "".join(parts)
+
+
+def display_start_buttons(tasks):
+    """Display the Start/Continue buttons for the tasks in the grid"""
+    cols = st.columns(2)
+    for i, task in enumerate(tasks):
+        with cols[i % 2]:
+            if task.status == "completed":
+                st.button(f"✅ Completed: {task.title}", key=f"start_task_{task.id}", disabled=True, use_container_width=True)
+                continue
+            
             if st.button(
-                "▶️ Start" if task.status == "pending" else "▶️ Continue",
+                f"{'▶️ Start' if task.status == 'pending' else '▶️ Continue'}: {task.title}",
                 key=f"start_task_{task.id}",
                 type="primary",
                 use_container_width=True
@@ -116,48 +145,141 @@ def display_task_grid_card(task, index):
                 st.session_state.current_task = task
                 
                 # Update task status
-                task.status = "in_progress"
+                set_task_status(task, "in_progress")
                 
                 # Initialize timer
                 st.session_state.time_remaining = task.estimated_duration * 60  # Convert to seconds
                 st.session_state.session_start = time.time()
                 st.session_state.timer_running = True
                 
-                # Show success toast
-                st.toast(f"Starting focus session on: {task.title}", icon="✅")
+                # Show success toast on the next run (st.rerun discards this one)
+                st.session_state.pending_toast = {"body": f"Starting focus session on: {task.title}", "icon": "✅"}
                 
                 # Switch to Focus Session tab
                 st.session_state.active_tab = "focus"
-                time.sleep(0.5)  # Brief delay for toast to show
                 st.rerun()
-        else:
-            st.success("✅ Completed", icon="✅")
 
 
-def sort_tasks(tasks, sort_by):
-    """Sort tasks based on selected criteria"""
+def sort_tasks(table, rows, sort_by):
+    """Sort task rows based on selected criteria"""
     if sort_by == "Duration":
-        return sorted(tasks, key=lambda t: t.estimated_duration, reverse=True)
+        keys = -table.duration[rows]
     elif sort_by == "Priority":
-        return sorted(tasks, key=lambda t: t.priority_score, reverse=True)
+        keys = -table.priority[rows]
     elif sort_by == "Created":
-        return sorted(tasks, key=lambda t: t.created_at, reverse=True)
+        keys = -table.created[rows]
     elif sort_by == "Title":
-        return sorted(tasks, key=lambda t: t.title.lower())
-    return tasks
+        keys = table.title_key[rows]
+    else:
+        return rows
+    return rows[np.argsort(keys, kind="stable")]
+
+
+def filter_tasks(table, filter_by):
+    """Filter task rows based on status"""
+    status = STATUS_FILTERS.get(filter_by)
+    if status is None:
+        return np.arange(len(table))
+    return np.flatnonzero(table.status == STATUS_CODES[status])
+
+
+def get_task_view(sort_by, filter_by):
+    """Get the filtered and sorted task rows, recomputed only when tasks change"""
+    # Drop every cached view once the tasks have changed
+    if st.session_state.task_views_version != st.session_state.tasks_version:
+        st.session_state.task_views = {}
+        st.session_state.task_views_version = st.session_state.tasks_version
+    
+    view_key = (sort_by, filter_by)
+    if view_key not in st.session_state.task_views:
+        table = st.session_state.task_table
+        st.session_state.task_views[view_key] = sort_tasks(table, filter_tasks(table, filter_by), sort_by)
+    
+    return st.session_state.task_views[view_key]
+
+
+def set_task_page(page):
+    """Move the Tasks grid to another page"""
+    st.session_state.task_page = page
+
+
+def remember_choice(widget_key, value_key):
+    """Copy a widget's value to a plain session key, which survives while the widget's tab is closed"""
+    st.session_state[value_key] = st.session_state[widget_key]
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_coach_message(_client, ai_source, event, task, duration_bucket):
+    """Fetch a coach message (cached per AI source, event, task and duration bucket)"""
+    return _client.get_coach_message(event, {'task': task, 'duration': duration_bucket})
+
+
+def coach_message(client, event, task, duration):
+    """Get a coach message, with the duration rounded to a 15-minute bucket"""
+    duration_bucket = max(15, round(duration / 15) * 15)
+    return _cached_coach_message(client, client.get_ai_source(), event, task, duration_bucket)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_session_statistics(_client):
+    """Fetch today's session statistics from Snowflake (cached briefly)"""
+    return _client.get_session_statistics()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_recent_tasks(_client, limit):
+    """Fetch the newest saved tasks from Snowflake (cached until the next save or TTL)"""
+    return _client.get_recent_tasks(limit=limit)
+
+
+@st.cache_resource
+def get_background_executor():
+    """Get the worker pool for Snowflake calls that should not block a run"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="focus_flow")
+
+
+def report_finished_saves():
+    """Show a toast for each background task save that has finished"""
+    pending = []
+    for future in st.session_state.pending_saves:
+        if not future.done():
+            pending.append(future)
+        elif future.exception() is None:
+            st.toast(future.result())
+            # Analytics should show the new row on its next load
+            cached_recent_tasks.clear()
+            cached_session_statistics.clear()
+        else:
+            st.toast(f"Could not save task: {future.exception()}", icon="⚠️")
+    st.session_state.pending_saves = pending
+
+
+def show_more_journal_tasks(shown):
+    """Extend the Journal tab's task list to the next batch"""
+    st.session_state.journal_tasks_shown = shown
+
+
+def pause_timer():
+    """Pause the focus timer, keeping the time left"""
+    st.session_state.timer_running = False
+    # Update time_remaining to current remaining time
+    elapsed = time.time() - st.session_state.session_start
+    st.session_state.time_remaining = max(0, st.session_state.time_remaining - elapsed)
+
 
+def resume_timer():
+    """Resume the focus timer from the time left"""
+    st.session_state.timer_running = True
+    st.session_state.session_start = time.time()
 
-def filter_tasks(tasks, filter_by):
-    """Filter tasks based on status"""
-    if filter_by == "All":
-        return tasks
-    elif filter_by == "Pending":
-        return [t for t in tasks if t.status == "pending"]
-    elif filter_by == "In Progress":
-        return [t for t in tasks if t.status == "in_progress"]
-    elif filter_by == "Completed":
-        return [t for t in tasks if t.status == "completed"]
-    return tasks
+
+def timer_checkpoints(remaining, total_duration):
+    """Get the seconds-left marks where the focus session needs the server"""
+    # Checkpoints are the halfway coach message and the end of the session
+    halfway = total_duration / 2
+    if remaining > halfway and 'halfway_message_shown' not in st.session_state:
+        return [halfway, 0]
+    return [0]
 
 
 def display_focus_session():
@@ -168,10 +290,16 @@ def display_focus_session():
     
     # Check if current task exists
     if st.session_state.current_task is None:
+        completion_message = st.session_state.pop('completion_message', None)
+        if completion_message:
+            st.success(f"✅ {completion_message}")
+            if st.session_state.celebrate:
+                st.balloons()
+        
         st.info("👈 Select a task from the Tasks tab to start a focus session")
         
         # Show motivational message
-        start_message = client.get_coach_message('session_start', {'task': 'a task', 'duration': 60})
+        start_message = coach_message(client, 'session_start', 'a task', 60)
         st.info(f"🎙️ Coach: {start_message}")
         return
     
@@ -190,38 +318,23 @@ def display_focus_session():
     else:
         remaining = st.session_state.time_remaining
     
-    # Format timer display
-    minutes = int(remaining // 60)
-    seconds = int(remaining % 60)
-    timer_display = f"{minutes:02d}:{seconds:02d}"
-    
     # Calculate progress
     total_duration = task.estimated_duration * 60  # seconds
     progress = 1 - (remaining / total_duration) if total_duration > 0 else 1.0
     progress = max(0.0, min(1.0, progress))  # Clamp between 0 and 1
     
-    # Display timer in center with large font
-    st.markdown(
-        f"""
-        <div style="text-align: center; margin: 40px 0;">
-            <div style="font-size: 72px; font-weight: bold; color: #667eea; font-family: monospace;">
-                {timer_display}
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
+    # Display timer and progress bar together (both update in the browser,
+    # which reruns this fragment only at the next checkpoint)
+    focus_timer_component(
+        remaining,
+        st.session_state.timer_running,
+        total_duration,
+        checkpoints=timer_checkpoints(remaining, total_duration)
     )
     
-    # Progress bar
-    st.progress(progress)
-    st.caption(f"Progress: {progress * 100:.1f}%")
-    
     # Show coach message at halfway point
     if 0.45 <= progress <= 0.55 and 'halfway_message_shown' not in st.session_state:
-        halfway_message = client.get_coach_message(
-            'halfway',
-            {'task': task.title, 'duration': task.estimated_duration}
-        )
+        halfway_message = coach_message(client, 'halfway', task.title, task.estimated_duration)
         st.info(f"🎙️ Coach: {halfway_message}")
         st.session_state.halfway_message_shown = True
     
@@ -230,54 +343,32 @@ def display_focus_session():
     # Control buttons
     col1, col2, col3 = st.columns(3)
     
+    # Pause/Resume update state in callbacks so only this fragment reruns
     with col1:
         if st.session_state.timer_running:
-            if st.button("⏸️ Pause", use_container_width=True):
-                st.session_state.timer_running = False
-                # Update time_remaining to current remaining time
-                elapsed = time.time() - st.session_state.session_start
-                st.session_state.time_remaining = max(0, st.session_state.time_remaining - elapsed)
-                st.rerun()
+            st.button("⏸️ Pause", on_click=pause_timer, use_container_width=True)
     
     with col2:
         if not st.session_state.timer_running and remaining > 0:
-            if st.button("▶️ Resume", use_container_width=True):
-                st.session_state.timer_running = True
-                st.session_state.session_start = time.time()
-                st.rerun()
+            st.button("▶️ Resume", on_click=resume_timer, use_container_width=True)
     
     with col3:
         if st.button("✅ Complete", type="primary", use_container_width=True):
             # Mark task as completed
-            task.status = "completed"
+            set_task_status(task, "completed")
             
             # Update statistics
             actual_time = (task.estimated_duration * 60 - remaining) // 60  # Convert back to minutes
             st.session_state.completed_sessions += 1
             st.session_state.total_focus_time += actual_time
+            st.session_state.total_focus_time_str = format_minutes(st.session_state.total_focus_time)
             
             # Get completion message from coach
-            completion_message = client.get_coach_message(
-                'completion',
-                {'task': task.title, 'duration': actual_time}
-            )
+            completion_message = coach_message(client, 'completion', task.title, actual_time)
             
-            # Try to save task to database (if Snowflake connected)
-            try:
-                task_data = {
-                    'task_id': task.id,
-                    'title': task.title,
-                    'description': task.description,
-                    'estimated_duration': task.estimated_duration,
-                    'subtasks': task.subtasks,
-                    'status': 'completed',
-                    'priority_score': task.priority_score
-                }
-                save_result = client.save_task(task_data)
-                st.success(save_result)
-            except Exception as e:
-                # Database save failed - that's OK in demo mode
-                pass
+            # Save task to database in the background (if Snowflake connected)
+            if client.is_connected:
+                st.session_state.pending_saves.append(get_background_executor().submit(client.save_task, task.to_record()))
             
             # Reset timer state
             st.session_state.current_task = None
@@ -286,23 +377,370 @@ def display_focus_session():
             st.session_state.session_start = None
             st.session_state.pop('halfway_message_shown', None)
             
-            # Show success message with coach feedback
-            st.success(f"✅ {completion_message}")
-            st.balloons()
-            
-            time.sleep(2)
+            # Show success message with coach feedback after the rerun
+            st.session_state.completion_message = completion_message
             st.rerun()
     
-    # Auto-rerun every second if timer is running
-    if st.session_state.timer_running and remaining > 0:
-        time.sleep(1)
-        st.rerun()
-    
     # Timer finished
     if remaining <= 0 and st.session_state.timer_running:
         st.session_state.timer_running = False
         st.success("⏰ Time's up! Great work on this focus session!")
-        st.balloons()
+        if st.session_state.celebrate:
+            st.balloons()
+
+
+def background_journal_parse(client, parse_future, journal_text):
+    """Collect a background Cortex parse, falling back to mock AI on the script thread so its warning shows"""
+    try:
+        return parse_future.result(), client.get_ai_source()
+    except Exception as e:
+        print(f"Snowflake Cortex AI error: {str(e)}")
+        return client.parse_journal_fallback(journal_text), "Mock AI (Cortex unavailable)"
+
+
+def finish_journal_parse(client, parse):
+    """Turn parsed journal data (task dicts plus the AI source that produced them) into tasks, reporting a failed parse"""
+    try:
+        parsed_tasks_data, ai_source = parse()
+        
+        # Convert to Task objects (one timestamp for the whole batch),
+        # drawing each card into a single placeholder as soon as it is built
+        from utils.models import Task
+        now = datetime.now()
+        preview = st.empty()
+        parsed_tasks = []
+        for task_data in parsed_tasks_data:
+            parsed_tasks.append(Task(
+                id=task_data.get('task_id', str(uuid.uuid4())),
+                title=task_data.get('title', 'Untitled Task'),
+                description=task_data.get('description', ''),
+                estimated_duration=task_data.get('estimated_duration', 60),
+                subtasks=task_data.get('subtasks', []),
+                status=task_data.get('status', 'pending'),
+                priority_score=task_data.get('priority_score', 50.0),
+                created_at=now
+            ))
+            preview.markdown(render_cards_html(parsed_tasks), unsafe_allow_html=True)
+        
+        # Add tasks to session state
+        add_tasks(parsed_tasks)
+        
+        # Show success message
+        st.success(f"✅ {len(parsed_tasks)} tasks created using {ai_source}!")
+        
+        # Get a motivational coach message
+        start_message = coach_message(
+            client,
+            'session_start',
+            'your new tasks',
+            sum(t.estimated_duration for t in parsed_tasks)
+        )
+        st.info(f"🎙️ Coach: {start_message}")
+        
+        # Clear journal input
+        st.session_state.journal_input = ""
+        st.rerun()
+    
+    except Exception as e:
+        st.error(f"❌ Error parsing journal: {str(e)}")
+        st.info("💡 The app is still functional. Try again or check your connection.")
+
+
+@st.fragment(run_every=0.5)
+def poll_journal_parse():
+    """Rerun the app once the background journal parse has finished"""
+    parse_future = st.session_state.get('parse_future')
+    if parse_future is None or parse_future.done():
+        st.rerun()
+
+
+@st.fragment
+def render_sidebar(client):
+    """Render the sidebar connection, settings and stats"""
+    # Connection status
+    st.header("🔌 Connection")
+    show_connection_status(client)
+    
+    # Cache clear button (for debugging)
+    if st.button("🔄 Refresh Connection", help="Clear cache and reconnect"):
+        st.cache_resource.clear()
+        st.rerun()
+    
+    st.header("⚙️ Settings")
+    
+    # Work duration slider
+    work_duration = st.slider(
+        "Work Duration (minutes)",
+        min_value=30,
+        max_value=120,
+        value=st.session_state.work_duration,
+        step=15,
+        key='work_duration'
+    )
+    
+    # Break duration slider
+    break_duration = st.slider(
+        "Break Duration (minutes)",
+        min_value=5,
+        max_value=30,
+        value=st.session_state.break_duration,
+        step=5,
+        key='break_duration'
+    )
+    
+    # Voice coach toggle
+    voice_coach = st.toggle(
+        "Voice Coach",
+        value=st.session_state.voice_coach,
+        key='voice_coach'
+    )
+    
+    # Celebration animation toggle
+    st.toggle(
+        "Celebrations",
+        value=st.session_state.celebrate,
+        key='celebrate',
+        help="Show balloons when a focus session ends"
+    )
+    
+    # Add spacing
+    st.divider()
+    
+    # Today's Stats section
+    st.header("📊 Today's Stats")
+    
+    show_metric_tiles([
+        ("Focus Sessions", st.session_state.completed_sessions),
+        ("Total Time", st.session_state.total_focus_time_str),
+        ("Tasks Done", st.session_state.status_counts['completed']),
+        ("Streak", "0 days")
+    ], columns=2)
+
+
+@st.fragment
+def render_journal_tab(client):
+    """Render the Journal tab"""
+    st.write("### What's on your mind?")
+    st.caption("Write naturally about what you need to do. I'll break it down into manageable tasks.")
+    
+    # Initialize journal_input in session state if not exists
+    if 'journal_input' not in st.session_state:
+        st.session_state.journal_input = ""
+    
+    # Journal text area
+    journal_input = st.text_area(
+        "Journal Entry",
+        value=st.session_state.journal_input,
+        height=200,
+        placeholder="I need to finish the project proposal by Friday. This includes researching competitors, writing the executive summary, and creating a budget breakdown...",
+        key='journal_text_area'
+    )
+    
+    # Update session state with journal input
+    st.session_state.journal_input = journal_input
+    
+    parse_future = st.session_state.get('parse_future')
+    
+    # Break it Down button
+    if st.button("✨ Break it Down", type="primary", use_container_width=True, disabled=parse_future is not None):
+        if not journal_input.strip():
+            st.warning("Please write something in your journal entry first.")
+        elif client.is_connected:
+            # Run only the Cortex call in the background (no st.* calls) and poll for the result
+            st.session_state.parse_journal_text = journal_input
+            st.session_state.parse_future = get_background_executor().submit(client.parse_journal_cortex, journal_input)
+            st.rerun()
+        else:
+            # Mock AI is local and fast, so parse right away
+            with st.spinner(f"🤖 {client.get_ai_source()} is analyzing your tasks..."):
+                finish_journal_parse(client, lambda: (client.parse_journal(journal_input), client.get_ai_source()))
+    
+    # Pick up a background parse once it has finished
+    if parse_future is not None:
+        if parse_future.done():
+            del st.session_state.parse_future
+            journal_text = st.session_state.pop('parse_journal_text', journal_input)
+            finish_journal_parse(client, lambda: background_journal_parse(client, parse_future, journal_text))
+        else:
+            st.info(f"🤖 {client.get_ai_source()} is analyzing your tasks...")
+            poll_journal_parse()
+    
+    # Display parsed tasks if any exist
+    if st.session_state.tasks:
+        st.divider()
+        st.write("### 📋 Parsed Tasks")
+        st.caption(f"Total: {len(st.session_state.tasks)} tasks")
+        
+        # Render the list in batches, extended with "Show more"
+        shown = st.session_state.get('journal_tasks_shown', TASK_PAGE_SIZE)
+        for task in st.session_state.tasks[:shown]:
+            display_task_card(task)
+        
+        if len(st.session_state.tasks) > shown:
+            st.button(
+                f"Show more ({len(st.session_state.tasks) - shown} remaining)",
+                on_click=show_more_journal_tasks,
+                args=(shown + TASK_PAGE_SIZE,),
+                use_container_width=True
+            )
+
+
+@st.fragment
+def render_tasks_tab():
+    """Render the Tasks tab"""
+    st.write("### Your Task List")
+    
+    # Check if tasks exist
+    if not st.session_state.tasks:
+        st.info("No tasks yet. Go to the Journal tab to create some!")
+    else:
+        # Filter and Sort Controls
+        col1, col2, col3 = st.columns([2, 2, 4])
+        
+        with col1:
+            sort_options = ["Duration", "Priority", "Created", "Title"]
+            sort_option = st.selectbox(
+                "Sort by",
+                options=sort_options,
+                index=sort_options.index(st.session_state.get('task_sort_value', "Duration")),
+                key="task_sort",
+                on_change=remember_choice,
+                args=("task_sort", "task_sort_value")
+            )
+        
+        with col2:
+            filter_options = ["All", "Pending", "In Progress", "Completed"]
+            filter_option = st.selectbox(
+                "Filter",
+                options=filter_options,
+                index=filter_options.index(st.session_state.get('task_filter_value', "All")),
+                key="task_filter",
+                on_change=remember_choice,
+                args=("task_filter", "task_filter_value")
+            )
+        
+        st.divider()
+        
+        # Apply filtering and sorting
+        rows = get_task_view(sort_option, filter_option)
+        
+        # Display task count
+        st.caption(f"Showing {len(rows)} of {len(st.session_state.tasks)} tasks")
+        
+        # Display one page of tasks in grid layout (2 columns) as one HTML block
+        if len(rows):
+            total_pages = (len(rows) + TASK_PAGE_SIZE - 1) // TASK_PAGE_SIZE
+            page = min(st.session_state.get('task_page', 0), total_pages - 1)
+            start = page * TASK_PAGE_SIZE
+            page_tasks = [st.session_state.tasks[row] for row in rows[start:start + TASK_PAGE_SIZE]]
+            
+            st.markdown(render_cards_html(page_tasks), unsafe_allow_html=True)
+            display_start_buttons(page_tasks)
+            
+            # Page navigation
+            if total_pages > 1:
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    st.button("◀️ Previous", disabled=page == 0, on_click=set_task_page, args=(page - 1,), use_container_width=True)
+                with col_page:
+                    st.caption(f"Page {page + 1} of {total_pages}")
+                with col_next:
+                    st.button("Next ▶️", disabled=page == total_pages - 1, on_click=set_task_page, args=(page + 1,), use_container_width=True)
+        else:
+            st.info(f"No tasks match the filter: {filter_option}")
+
+
+@st.fragment
+def render_focus_tab():
+    """Render the Focus Session tab"""
+    st.write("### Focus Session")
+    display_focus_session()
+
+
+@st.fragment
+def render_analytics_tab(client):
+    """Render the Analytics tab"""
+    st.write("### 📊 Analytics & Insights")
+    
+    # Check if connected to Snowflake for analytics
+    if client and client.is_connected:
+        st.info(f"📡 Connected to {client.get_ai_source()} - Real-time analytics available!")
+        
+        try:
+            # Get session statistics from Snowflake
+            stats = cached_session_statistics(client)
+            
+            st.subheader("Today's Performance")
+            
+            show_metric_tiles([
+                ("Total Sessions", stats.get('total_sessions', 0), "Number of focus sessions completed today"),
+                ("Total Time", format_minutes(stats.get('total_minutes', 0)), "Total focus time today"),
+                ("Completion Rate", f"{stats.get('completion_rate', 0)}%", "Percentage of sessions completed"),
+                ("Unique Tasks", stats.get('unique_tasks', 0), "Number of different tasks worked on")
+            ], columns=4)
+            
+            st.divider()
+            
+            # Get the last 10 tasks from database (ordered and limited in SQL)
+            try:
+                recent_tasks = cached_recent_tasks(client, 10)
+                
+                if recent_tasks:
+                    st.subheader("📋 Task History")
+                    st.caption(f"Showing the {len(recent_tasks)} most recent tasks from database")
+                    
+                    # Display recent tasks
+                    for task in recent_tasks:
+                        with st.expander(f"{'✅' if task['status'] == 'completed' else '⏳'} {task['title']}"):
+                            st.write(f"**Description:** {task['description']}")
+                            st.write(f"**Duration:** {task['estimated_duration']} minutes")
+                            st.write(f"**Status:** {task['status']}")
+                            st.write(f"**Priority:** {task['priority_score']}")
+                            st.caption(f"Created: {task['created_at']}")
+                else:
+                    st.info("No task history yet. Complete some tasks to see analytics!")
+            
+            except Exception as e:
+                st.warning(f"⚠️ Could not load task history: {str(e)}")
+        
+        except Exception as e:
+            st.error(f"❌ Error loading analytics: {str(e)}")
+    
+    else:
+        # Demo mode analytics
+        st.warning("⚠️ Running in Demo Mode - Analytics limited to session data")
+        
+        st.subheader("Session Statistics")
+        
+        # Running per-status totals, so no pass over the task list is needed
+        status_counts = st.session_state.status_counts
+        
+        show_metric_tiles([
+            ("Tasks Created", len(st.session_state.tasks)),
+            ("Tasks Completed", status_counts['completed']),
+            ("Focus Time", st.session_state.total_focus_time_str)
+        ], columns=3)
+        
+        st.info("""
+        **💡 Connect to Snowflake for:**
+        - Persistent task storage
+        - Historical analytics
+        - Advanced insights
+        - Cross-device sync
+        
+        Check the sidebar for connection options.
+        """)
+        
+        # Show task breakdown
+        if st.session_state.tasks:
+            st.divider()
+            st.subheader("Task Status Breakdown")
+            
+            show_metric_tiles([
+                ("⏳ Pending", status_counts['pending']),
+                ("▶️ In Progress", status_counts['in_progress']),
+                ("✅ Completed", status_counts['completed'])
+            ], columns=3)
 
 
 def main():
@@ -319,6 +757,14 @@ def main():
     # Initialize Snowflake client (with automatic fallback to mock AI)
     client = get_snowflake_client()
     
+    # Report task saves that finished since the last run
+    report_finished_saves()
+    
+    # Show a toast queued by a handler that reran the app
+    pending_toast = st.session_state.pop('pending_toast', None)
+    if pending_toast:
+        st.toast(**pending_toast)
+    
     # Initialize active tab if not exists
     if 'active_tab' not in st.session_state:
         st.session_state.active_tab = "journal"
@@ -333,338 +779,33 @@ def main():
     
     # Sidebar
     with st.sidebar:
-        # Connection status
-        st.header("🔌 Connection")
-        show_connection_status(client)
-        
-        # Cache clear button (for debugging)
-        if st.button("🔄 Refresh Connection", help="Clear cache and reconnect"):
-            st.cache_resource.clear()
-            st.rerun()
-        
-        st.header("⚙️ Settings")
-        
-        # Work duration slider
-        work_duration = st.slider(
-            "Work Duration (minutes)",
-            min_value=30,
-            max_value=120,
-            value=st.session_state.work_duration,
-            step=15,
-            key='work_duration'
-        )
-        
-        # Break duration slider
-        break_duration = st.slider(
-            "Break Duration (minutes)",
-            min_value=5,
-            max_value=30,
-            value=st.session_state.break_duration,
-            step=5,
-            key='break_duration'
-        )
-        
-        # Voice coach toggle
-        voice_coach = st.toggle(
-            "Voice Coach",
-            value=st.session_state.voice_coach,
-            key='voice_coach'
-        )
-        
-        # Add spacing
-        st.divider()
-        
-        # Today's Stats section
-        st.header("📊 Today's Stats")
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric(
-                "Focus Sessions", 
-                st.session_state.completed_sessions, 
-                delta=None
-            )
-            st.metric(
-                "Tasks Done", 
-                len([t for t in st.session_state.tasks if t.status == 'completed']), 
-                delta=None
-            )
-        
-        with col2:
-            hours = st.session_state.total_focus_time // 60
-            minutes = st.session_state.total_focus_time % 60
-            st.metric(
-                "Total Time", 
-                f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m", 
-                delta=None
-            )
-            st.metric("Streak", "0 days", delta=None)
+        render_sidebar(client)
     
     # Main content area with tabs
     # Determine selected tab based on session state
     tab_names = ["📝 Journal", "✅ Tasks", "⏱️ Focus Session", "📊 Analytics"]
     if st.session_state.active_tab == "focus":
-        default_index = 2
+        st.session_state.main_tab = tab_names[2]
         st.session_state.active_tab = "journal"  # Reset for next time
-    else:
-        default_index = 0
     
-    tab1, tab2, tab3, tab4 = st.tabs(tab_names)
+    # Rerun on tab change so only the open tab is rendered
+    tab1, tab2, tab3, tab4 = st.tabs(tab_names, key="main_tab", on_change="rerun")
     
     with tab1:
-        st.write("### What's on your mind?")
-        st.caption("Write naturally about what you need to do. I'll break it down into manageable tasks.")
-        
-        # Initialize journal_input in session state if not exists
-        if 'journal_input' not in st.session_state:
-            st.session_state.journal_input = ""
-        
-        # Journal text area
-        journal_input = st.text_area(
-            "Journal Entry",
-            value=st.session_state.journal_input,
-            height=200,
-            placeholder="I need to finish the project proposal by Friday. This includes researching competitors, writing the executive summary, and creating a budget breakdown...",
-            key='journal_text_area'
-        )
-        
-        # Update session state with journal input
-        st.session_state.journal_input = journal_input
-        
-        # Break it Down button
-        if st.button("✨ Break it Down", type="primary", use_container_width=True):
-            if journal_input.strip():
-                # Show spinner while processing
-                with st.spinner(f"🤖 {client.get_ai_source()} is analyzing your tasks..."):
-                    try:
-                        # Parse journal using Snowflake client (with automatic fallback)
-                        parsed_tasks_data = client.parse_journal(journal_input)
-                        
-                        # Convert to Task objects
-                        from utils.models import Task
-                        parsed_tasks = []
-                        for task_data in parsed_tasks_data:
-                            task = Task(
-                                id=task_data.get('task_id', str(uuid.uuid4())),
-                                title=task_data.get('title', 'Untitled Task'),
-                                description=task_data.get('description', ''),
-                                estimated_duration=task_data.get('estimated_duration', 60),
-                                subtasks=task_data.get('subtasks', []),
-                                status=task_data.get('status', 'pending'),
-                                priority_score=task_data.get('priority_score', 50.0),
-                                created_at=datetime.now()
-                            )
-                            parsed_tasks.append(task)
-                        
-                        # Add tasks to session state
-                        st.session_state.tasks.extend(parsed_tasks)
-                        
-                        # Show success message
-                        st.success(f"✅ {len(parsed_tasks)} tasks created using {client.get_ai_source()}!")
-                        
-                        # Get a motivational coach message
-                        coach_message = client.get_coach_message(
-                            'session_start',
-                            {'task': 'your new tasks', 'duration': sum(t.estimated_duration for t in parsed_tasks)}
-                        )
-                        st.info(f"🎙️ Coach: {coach_message}")
-                        
-                        # Display balloons animation
-                        st.balloons()
-                        
-                        # Clear journal input
-                        st.session_state.journal_input = ""
-                        st.rerun()
-                        
-                    except Exception as e:
-                        st.error(f"❌ Error parsing journal: {str(e)}")
-                        st.info("💡 The app is still functional. Try again or check your connection.")
-            else:
-                st.warning("Please write something in your journal entry first.")
-        
-        # Display parsed tasks if any exist
-        if st.session_state.tasks:
-            st.divider()
-            st.write("### 📋 Parsed Tasks")
-            st.caption(f"Total: {len(st.session_state.tasks)} tasks")
-            
-            for task in st.session_state.tasks:
-                display_task_card(task)
+        if tab1.open:
+            render_journal_tab(client)
     
     with tab2:
-        st.write("### Your Task List")
-        
-        # Check if tasks exist
-        if not st.session_state.tasks:
-            st.info("No tasks yet. Go to the Journal tab to create some!")
-        else:
-            # Filter and Sort Controls
-            col1, col2, col3 = st.columns([2, 2, 4])
-            
-            with col1:
-                sort_option = st.selectbox(
-                    "Sort by",
-                    options=["Duration", "Priority", "Created", "Title"],
-                    key="task_sort"
-                )
-            
-            with col2:
-                filter_option = st.selectbox(
-                    "Filter",
-                    options=["All", "Pending", "In Progress", "Completed"],
-                    key="task_filter"
-                )
-            
-            st.divider()
-            
-            # Apply filtering and sorting
-            filtered_tasks = filter_tasks(st.session_state.tasks, filter_option)
-            sorted_tasks = sort_tasks(filtered_tasks, sort_option)
-            
-            # Display task count
-            st.caption(f"Showing {len(sorted_tasks)} of {len(st.session_state.tasks)} tasks")
-            
-            # Display tasks in grid layout (2 columns)
-            if sorted_tasks:
-                for i in range(0, len(sorted_tasks), 2):
-                    cols = st.columns(2)
-                    
-                    # First column
-                    with cols[0]:
-                        display_task_grid_card(sorted_tasks[i], i)
-                    
-                    # Second column (if task exists)
-                    if i + 1 < len(sorted_tasks):
-                        with cols[1]:
-                            display_task_grid_card(sorted_tasks[i + 1], i + 1)
-            else:
-                st.info(f"No tasks match the filter: {filter_option}")
+        if tab2.open:
+            render_tasks_tab()
     
     with tab3:
-        st.write("### Focus Session")
-        display_focus_session()
+        if tab3.open:
+            render_focus_tab()
     
     with tab4:
-        st.write("### 📊 Analytics & Insights")
-        
-        # Check if connected to Snowflake for analytics
-        if client and client.is_connected:
-            st.info(f"📡 Connected to {client.get_ai_source()} - Real-time analytics available!")
-            
-            try:
-                # Get session statistics from Snowflake
-                stats = client.get_session_statistics()
-                
-                st.subheader("Today's Performance")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.metric(
-                        "Total Sessions",
-                        stats.get('total_sessions', 0),
-                        help="Number of focus sessions completed today"
-                    )
-                
-                with col2:
-                    total_min = stats.get('total_minutes', 0)
-                    hours = total_min // 60
-                    minutes = total_min % 60
-                    st.metric(
-                        "Total Time",
-                        f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m",
-                        help="Total focus time today"
-                    )
-                
-                with col3:
-                    st.metric(
-                        "Completion Rate",
-                        f"{stats.get('completion_rate', 0)}%",
-                        help="Percentage of sessions completed"
-                    )
-                
-                with col4:
-                    st.metric(
-                        "Unique Tasks",
-                        stats.get('unique_tasks', 0),
-                        help="Number of different tasks worked on"
-                    )
-                
-                st.divider()
-                
-                # Get all tasks from database
-                try:
-                    all_tasks = client.get_all_tasks()
-                    
-                    if all_tasks:
-                        st.subheader("📋 Task History")
-                        st.caption(f"Showing {len(all_tasks)} tasks from database")
-                        
-                        # Display recent tasks
-                        for task in all_tasks[:10]:  # Show last 10 tasks
-                            with st.expander(f"{'✅' if task['status'] == 'completed' else '⏳'} {task['title']}"):
-                                st.write(f"**Description:** {task['description']}")
-                                st.write(f"**Duration:** {task['estimated_duration']} minutes")
-                                st.write(f"**Status:** {task['status']}")
-                                st.write(f"**Priority:** {task['priority_score']}")
-                                st.caption(f"Created: {task['created_at']}")
-                    else:
-                        st.info("No task history yet. Complete some tasks to see analytics!")
-                
-                except Exception as e:
-                    st.warning(f"⚠️ Could not load task history: {str(e)}")
-            
-            except Exception as e:
-                st.error(f"❌ Error loading analytics: {str(e)}")
-        
-        else:
-            # Demo mode analytics
-            st.warning("⚠️ Running in Demo Mode - Analytics limited to session data")
-            
-            st.subheader("Session Statistics")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric("Tasks Created", len(st.session_state.tasks))
-            
-            with col2:
-                completed = len([t for t in st.session_state.tasks if t.status == 'completed'])
-                st.metric("Tasks Completed", completed)
-            
-            with col3:
-                hours = st.session_state.total_focus_time // 60
-                minutes = st.session_state.total_focus_time % 60
-                st.metric("Focus Time", f"{hours}h {minutes}m" if hours > 0 else f"{minutes}m")
-            
-            st.info("""
-            **💡 Connect to Snowflake for:**
-            - Persistent task storage
-            - Historical analytics
-            - Advanced insights
-            - Cross-device sync
-            
-            Check the sidebar for connection options.
-            """)
-            
-            # Show task breakdown
-            if st.session_state.tasks:
-                st.divider()
-                st.subheader("Task Status Breakdown")
-                
-                status_counts = {
-                    'pending': len([t for t in st.session_state.tasks if t.status == 'pending']),
-                    'in_progress': len([t for t in st.session_state.tasks if t.status == 'in_progress']),
-                    'completed': len([t for t in st.session_state.tasks if t.status == 'completed'])
-                }
-                
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("⏳ Pending", status_counts['pending'])
-                with col2:
-                    st.metric("▶️ In Progress", status_counts['in_progress'])
-                with col3:
-                    st.metric("✅ Completed", status_counts['completed'])
+        if tab4.open:
+            render_analytics_tab(client)
     
     # Footer
     st.divider()
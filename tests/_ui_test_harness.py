@@ -0,0 +1,19 @@
+"""
+UI Test Harness
+Shared helpers for the Streamlit UI component test apps
+"""
+
+
+# Mock client for testing
+class MockClient:
+    """Mock SnowflakeClient for testing UI components"""
+    
+    __slots__ = ("is_connected", "session")
+    
+    def __init__(self, connected=True):
+        self.is_connected = connected
+        self.session = None if not connected else "mock_session"
+    
+    def get_ai_source(self):
+        """Return AI source based on connection status"""
+        return "Snowflake Cortex AI" if self.is_connected else "Mock AI (Demo Mode)"
@@ -4,16 +4,83 @@ Interactive testing of all client methods
 """
 
 import streamlit as st
-import uuid
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from types import MappingProxyType
+from contextlib import contextmanager
+import traceback
 
-# Add parent directory to path to import utils
-parent_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(parent_dir))
+# Add parent directory to path to import utils (once, since Streamlit re-executes this script on every rerun)
+_ROOT = str(Path(__file__).resolve().parents[1])
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from utils.snowflake_client import get_snowflake_client
+from utils.models import Task
+
+
+@st.cache_resource(show_spinner=False)
+def _load_connection_details():
+    """Snapshot the Snowflake credentials once per process, for the Connection Details panel"""
+    try:
+        return MappingProxyType(dict(st.secrets["snowflake"]))
+    except Exception:
+        return MappingProxyType({})
+
+
+CONNECTION_DETAILS = _load_connection_details()
+
+
+@contextmanager
+def show_errors(action):
+    """Show any exception raised in the block as an error with its traceback"""
+    try:
+        yield
+    except Exception as e:
+        st.error(f"❌ Error {action}: {str(e)}")
+        with st.expander("🔍 Error Details"):
+            st.code(traceback.format_exc())
+
+
+# Retrieved tasks shown per page
+TASK_PAGE_SIZE = 20
+
+# Task status display for retrieved tasks
+STATUS_EMOJI = {'pending': '⏳', 'in_progress': '▶️', 'completed': '✅'}
+STATUS_LABELS = {'pending': 'Pending', 'in_progress': 'In Progress', 'completed': 'Completed'}
+STATUS_OPTIONS = tuple(STATUS_LABELS)
+
+# Default inputs for the journal and save tests
+SAMPLE_JOURNAL = "I need to prepare slides for my presentation, practice my demo, and send follow-up emails to attendees"
+SAMPLE_SUBTASKS = ('Setup environment', 'Write code', 'Test functionality')
+
+# Coach message buttons as (label, event) pairs
+COACH_EVENTS = (
+    ("▶️ Session Start", "session_start"),
+    ("⏱️ Halfway", "halfway"),
+    ("☕ Break", "break"),
+    ("✅ Completion", "completion")
+)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_parse_journal(_client, ai_source, journal_text):
+    """Parse a journal entry (cached per AI source and text)"""
+    return _client.parse_journal(journal_text)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_coach_messages(_client, ai_source, task, duration):
+    """Fetch every coach message in one call (cached per AI source, task and duration)"""
+    return _client.get_coach_messages({'task': task, 'duration': duration})
+
+
+@st.cache_data(ttl=60, show_spinner="📊 Fetching session statistics...")
+def cached_session_statistics(_client):
+    """Fetch today's session statistics (cached until the next saved session or TTL)"""
+    return _client.get_session_statistics()
 
 
 def main():
@@ -32,9 +99,8 @@ def main():
     
     st.divider()
     
-    # Get the Snowflake client
-    with st.spinner("Initializing Snowflake connection..."):
-        client = get_snowflake_client()
+    # Get the Snowflake client (cached, so only the first run connects)
+    client = get_snowflake_client()
     
     # Display connection status
     if client and client.is_connected:
@@ -42,19 +108,19 @@ def main():
         
         # Display connection info
         with st.expander("🔍 Connection Details"):
-            try:
-                credentials = st.secrets["snowflake"]
+            credentials = CONNECTION_DETAILS
+            if credentials:
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Account", credentials['account'])
-                    st.metric("Warehouse", credentials['warehouse'])
+                    st.metric("Account", credentials.get('account', 'N/A'))
+                    st.metric("Warehouse", credentials.get('warehouse', 'N/A'))
                 with col2:
-                    st.metric("Database", credentials['database'])
-                    st.metric("Schema", credentials['schema'])
+                    st.metric("Database", credentials.get('database', 'N/A'))
+                    st.metric("Schema", credentials.get('schema', 'N/A'))
                 with col3:
-                    st.metric("Role", credentials['role'])
-            except Exception as e:
-                st.error(f"Error displaying connection details: {str(e)}")
+                    st.metric("Role", credentials.get('role', 'N/A'))
+            else:
+                st.error("Error displaying connection details: no [snowflake] section in secrets")
     else:
         st.error("❌ Not connected to Snowflake", icon="❌")
         st.info("💡 Please check your credentials in .streamlit/secrets.toml")
@@ -71,7 +137,7 @@ def main():
     # Journal input
     journal_text = st.text_area(
         "Enter journal text:",
-        value="I need to prepare slides for my presentation, practice my demo, and send follow-up emails to attendees",
+        value=SAMPLE_JOURNAL,
         height=150,
         key="journal_input"
     )
@@ -84,41 +150,39 @@ def main():
         if not journal_text.strip():
             st.warning("⚠️ Please enter some journal text first")
         else:
-            try:
+            with show_errors("parsing journal"):
+                st.session_state.pop('parsed_journal', None)
                 with st.spinner("⏳ Parsing with Snowflake Cortex AI..."):
                     # Parse journal using client
-                    parsed_tasks = client.parse_journal(journal_text)
-                
-                # Display results
-                st.success(f"✅ Successfully parsed {len(parsed_tasks)} tasks!", icon="🎉")
+                    st.session_state.parsed_journal = cached_parse_journal(client, client.get_ai_source(), journal_text)
+    
+    # Display results of the last parse
+    parsed_tasks = st.session_state.get('parsed_journal')
+    if parsed_tasks is not None:
+        st.success(f"✅ Successfully parsed {len(parsed_tasks)} tasks!", icon="🎉")
+        
+        # Show JSON, only sent to the browser while the expander is open
+        raw_json = st.expander("📋 View Raw JSON Response", key="raw_json", on_change="rerun")
+        if raw_json.open:
+            with raw_json:
+                st.json(parsed_tasks)
+        
+        # Display tasks in cards
+        st.subheader("Parsed Tasks:")
+        for i, task in enumerate(parsed_tasks, 1):
+            with st.container():
+                st.markdown(f"### Task {i}: {task.get('title', 'Untitled')}")
                 
-                # Show JSON
-                with st.expander("📋 View Raw JSON Response"):
-                    st.json(parsed_tasks)
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.write(f"**Description:** {task.get('description', 'No description')}")
+                with col2:
+                    st.metric("Duration", f"{task.get('estimated_duration', 0)} min")
                 
-                # Display tasks in cards
-                st.subheader("Parsed Tasks:")
-                for i, task in enumerate(parsed_tasks, 1):
-                    with st.container():
-                        st.markdown(f"### Task {i}: {task.get('title', 'Untitled')}")
-                        
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.write(f"**Description:** {task.get('description', 'No description')}")
-                        with col2:
-                            st.metric("Duration", f"{task.get('estimated_duration', 0)} min")
-                        
-                        # Display subtasks
-                        st.write("**Subtasks:**")
-                        for j, subtask in enumerate(task.get('subtasks', []), 1):
-                            st.write(f"   {j}. {subtask}")
-                        
-                        st.divider()
+                # Display subtasks as one numbered list
+                st.markdown("**Subtasks:**\n" + "".join(f"\n{j}. {subtask}" for j, subtask in enumerate(task.get('subtasks', []), 1)))
                 
-            except Exception as e:
-                st.error(f"❌ Error parsing journal: {str(e)}")
-                with st.expander("🔍 Error Details"):
-                    st.code(str(e))
+                st.divider()
     
     st.divider()
     
@@ -137,55 +201,15 @@ def main():
     
     # Coach message buttons
     st.write("**Click a button to generate a coaching message:**")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        if st.button("▶️ Session Start", use_container_width=True):
-            try:
-                with st.spinner("🤖 Generating message..."):
-                    message = client.get_coach_message(
-                        'session_start',
-                        {'task': task_name, 'duration': duration}
-                    )
-                st.info(f"🎙️ {message}")
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-    
-    with col2:
-        if st.button("⏱️ Halfway", use_container_width=True):
-            try:
-                with st.spinner("🤖 Generating message..."):
-                    message = client.get_coach_message(
-                        'halfway',
-                        {'task': task_name, 'duration': duration}
-                    )
-                st.info(f"🎙️ {message}")
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-    
-    with col3:
-        if st.button("☕ Break", use_container_width=True):
-            try:
-                with st.spinner("🤖 Generating message..."):
-                    message = client.get_coach_message(
-                        'break',
-                        {'task': task_name, 'duration': duration}
-                    )
-                st.info(f"🎙️ {message}")
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-    
-    with col4:
-        if st.button("✅ Completion", use_container_width=True):
-            try:
-                with st.spinner("🤖 Generating message..."):
-                    message = client.get_coach_message(
-                        'completion',
-                        {'task': task_name, 'duration': duration}
-                    )
-                st.info(f"🎙️ {message}")
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+    for (label, event), col in zip(COACH_EVENTS, st.columns(len(COACH_EVENTS))):
+        with col:
+            if st.button(label, use_container_width=True):
+                try:
+                    with st.spinner("🤖 Generating message..."):
+                        message = cached_coach_messages(client, client.get_ai_source(), task_name, duration)[event]
+                    st.info(f"🎙️ {message}")
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
     
     st.divider()
     
@@ -195,29 +219,32 @@ def main():
     st.header("💾 Test 3: Data Storage")
     st.caption("Save tasks to Snowflake database")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        test_task_title = st.text_input("Task Title", value="Test Task", key="save_title")
-    with col2:
-        test_task_duration = st.number_input("Duration (min)", min_value=30, max_value=120, value=60, key="save_duration")
-    with col3:
-        test_task_priority = st.slider("Priority", min_value=0.0, max_value=100.0, value=75.0, step=5.0, key="save_priority")
-    
-    test_task_desc = st.text_area("Description", value="This is a test task to verify data storage", key="save_desc")
+    # Forms batch their inputs, so editing fields does not rerun the app
+    with st.form("save_task_form"):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            test_task_title = st.text_input("Task Title", value="Test Task", key="save_title")
+        with col2:
+            test_task_duration = st.number_input("Duration (min)", min_value=30, max_value=120, value=60, key="save_duration")
+        with col3:
+            test_task_priority = st.slider("Priority", min_value=0.0, max_value=100.0, value=75.0, step=5.0, key="save_priority")
+        
+        test_task_desc = st.text_area("Description", value="This is a test task to verify data storage", key="save_desc")
+        
+        submitted = st.form_submit_button("💾 Save Test Task", type="primary")
     
-    if st.button("💾 Save Test Task", type="primary"):
-        try:
+    if submitted:
+        with show_errors("saving task"):
             # Create test task
-            test_task = {
-                'task_id': str(uuid.uuid4()),
-                'title': test_task_title,
-                'description': test_task_desc,
-                'estimated_duration': test_task_duration,
-                'subtasks': ['Setup environment', 'Write code', 'Test functionality'],
-                'status': 'pending',
-                'priority_score': test_task_priority
-            }
+            test_task = Task(
+                id=os.urandom(16).hex(),
+                title=test_task_title,
+                description=test_task_desc,
+                estimated_duration=test_task_duration,
+                subtasks=list(SAMPLE_SUBTASKS),
+                priority_score=test_task_priority
+            ).to_record()
             
             with st.spinner("💾 Saving to Snowflake..."):
                 result = client.save_task(test_task)
@@ -228,11 +255,6 @@ def main():
             # Display saved task details
             with st.expander("📋 Saved Task Details"):
                 st.json(test_task)
-                
-        except Exception as e:
-            st.error(f"❌ Error saving task: {str(e)}")
-            with st.expander("🔍 Error Details"):
-                st.code(str(e))
     
     st.divider()
     
@@ -246,54 +268,16 @@ def main():
     
     with col1:
         if st.button("🔄 Get All Tasks", type="primary", use_container_width=True):
-            try:
+            with show_errors("retrieving tasks"):
+                st.session_state.pop('retrieved_tasks', None)
                 with st.spinner("📥 Retrieving tasks from Snowflake..."):
-                    tasks = client.get_all_tasks()
-                
-                if not tasks:
-                    st.info("ℹ️ No tasks found in database")
-                else:
-                    st.success(f"✅ Retrieved {len(tasks)} tasks!", icon="📦")
-                    
-                    # Display tasks in expandable cards
-                    for i, task in enumerate(tasks, 1):
-                        with st.expander(f"📌 {task.get('title', 'Untitled Task')}", expanded=False):
-                            col1, col2, col3 = st.columns(3)
-                            
-                            with col1:
-                                st.metric("Duration", f"{task.get('estimated_duration', 0)} min")
-                            with col2:
-                                st.metric("Priority", f"{task.get('priority_score', 0):.1f}")
-                            with col3:
-                                status = task.get('status', 'unknown')
-                                status_emoji = {
-                                    'pending': '⏳',
-                                    'in_progress': '▶️',
-                                    'completed': '✅'
-                                }.get(status, '❓')
-                                st.metric("Status", f"{status_emoji} {status.replace('_', ' ').title()}")
-                            
-                            st.write(f"**Description:** {task.get('description', 'No description')}")
-                            st.caption(f"**Task ID:** `{task.get('task_id', 'N/A')}`")
-                            st.caption(f"**Created:** {task.get('created_at', 'Unknown')}")
-                            
-                            # Display subtasks if available
-                            subtasks = task.get('subtasks', [])
-                            if subtasks:
-                                st.write("**Subtasks:**")
-                                for j, subtask in enumerate(subtasks, 1):
-                                    st.write(f"   {j}. {subtask}")
-                    
-            except Exception as e:
-                st.error(f"❌ Error retrieving tasks: {str(e)}")
-                with st.expander("🔍 Error Details"):
-                    st.code(str(e))
+                    st.session_state.retrieved_tasks = client.get_all_tasks()
+                st.session_state.retrieved_page = 1
     
     with col2:
         if st.button("📊 Get Statistics", use_container_width=True):
             try:
-                with st.spinner("📊 Fetching session statistics..."):
-                    stats = client.get_session_statistics()
+                stats = cached_session_statistics(client)
                 
                 st.success("✅ Statistics retrieved!", icon="📈")
                 
@@ -309,6 +293,40 @@ def main():
             except Exception as e:
                 st.error(f"❌ Error getting statistics: {str(e)}")
     
+    # Display retrieved tasks one page at a time
+    tasks = st.session_state.get('retrieved_tasks')
+    if tasks is not None:
+        if not tasks:
+            st.info("ℹ️ No tasks found in database")
+        else:
+            st.success(f"✅ Retrieved {len(tasks)} tasks!", icon="📦")
+            
+            page_count = (len(tasks) - 1) // TASK_PAGE_SIZE + 1
+            page = st.number_input("Page", min_value=1, max_value=page_count, key="retrieved_page") if page_count > 1 else 1
+            start = (page - 1) * TASK_PAGE_SIZE
+            
+            # Display tasks in expandable cards
+            for task in tasks[start:start + TASK_PAGE_SIZE]:
+                with st.expander(f"📌 {task.get('title', 'Untitled Task')}", expanded=False):
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        st.metric("Duration", f"{task.get('estimated_duration', 0)} min")
+                    with col2:
+                        st.metric("Priority", f"{task.get('priority_score', 0):.1f}")
+                    with col3:
+                        status = task.get('status', 'unknown')
+                        status_label = STATUS_LABELS.get(status) or status.replace('_', ' ').title()
+                        st.metric("Status", f"{STATUS_EMOJI.get(status, '❓')} {status_label}")
+                    
+                    st.write(f"**Description:** {task.get('description', 'No description')}")
+                    st.caption(f"**Task ID:** `{task.get('task_id', 'N/A')}`  \n**Created:** {task.get('created_at', 'Unknown')}")
+                    
+                    # Display subtasks if available, as one numbered list
+                    subtasks = task.get('subtasks', [])
+                    if subtasks:
+                        st.markdown("**Subtasks:**\n" + "".join(f"\n{j}. {subtask}" for j, subtask in enumerate(subtasks, 1)))
+    
     st.divider()
     
     # ========================================
@@ -317,18 +335,21 @@ def main():
     st.header("⏱️ Test 5: Work Session Tracking")
     st.caption("Save completed work sessions to database")
     
-    col1, col2 = st.columns(2)
-    with col1:
-        session_duration = st.number_input("Session Duration (min)", min_value=5, max_value=120, value=45, key="session_duration")
-    with col2:
-        session_completed = st.checkbox("Completed", value=True, key="session_completed")
+    with st.form("save_session_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            session_duration = st.number_input("Session Duration (min)", min_value=5, max_value=120, value=45, key="session_duration")
+        with col2:
+            session_completed = st.checkbox("Completed", value=True, key="session_completed")
+        
+        submitted = st.form_submit_button("💾 Save Work Session", type="primary")
     
-    if st.button("💾 Save Work Session", type="primary"):
-        try:
+    if submitted:
+        with show_errors("saving work session"):
             # Create test session
             test_session = {
-                'session_id': str(uuid.uuid4()),
-                'task_id': str(uuid.uuid4()),  # Random task ID for test
+                'session_id': os.urandom(16).hex(),
+                'task_id': os.urandom(16).hex(),  # Random task ID for test
                 'start_time': datetime.now().isoformat(),
                 'duration_minutes': session_duration,
                 'completed': session_completed
@@ -336,17 +357,13 @@ def main():
             
             with st.spinner("💾 Saving work session..."):
                 result = client.save_work_session(test_session)
+            cached_session_statistics.clear()
             
             st.success(result, icon="✅")
             st.toast("✅ Work session saved!", icon="✅")
             
             with st.expander("📋 Session Details"):
                 st.json(test_session)
-                
-        except Exception as e:
-            st.error(f"❌ Error saving work session: {str(e)}")
-            with st.expander("🔍 Error Details"):
-                st.code(str(e))
     
     st.divider()
     
@@ -356,27 +373,25 @@ def main():
     st.header("🔄 Test 6: Update Task Status")
     st.caption("Update the status of existing tasks")
     
-    col1, col2 = st.columns(2)
-    with col1:
-        update_task_id = st.text_input("Task ID to Update", placeholder="Enter task ID from above", key="update_task_id")
-    with col2:
-        new_status = st.selectbox("New Status", options=["pending", "in_progress", "completed"], key="update_status")
+    with st.form("update_status_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            update_task_id = st.text_input("Task ID to Update", placeholder="Enter task ID from above", key="update_task_id")
+        with col2:
+            new_status = st.selectbox("New Status", options=STATUS_OPTIONS, key="update_status")
+        
+        submitted = st.form_submit_button("🔄 Update Status", type="primary")
     
-    if st.button("🔄 Update Status", type="primary"):
+    if submitted:
         if not update_task_id.strip():
             st.warning("⚠️ Please enter a task ID")
         else:
-            try:
+            with show_errors("updating status"):
                 with st.spinner("🔄 Updating task status..."):
                     result = client.update_task_status(update_task_id, new_status)
                 
                 st.success(result, icon="✅")
                 st.toast("✅ Status updated!", icon="✅")
-                
-            except Exception as e:
-                st.error(f"❌ Error updating status: {str(e)}")
-                with st.expander("🔍 Error Details"):
-                    st.code(str(e))
     
     # Footer
     st.divider()
@@ -5,11 +5,39 @@ Quick test script to verify mock AI fallback works
 
 import streamlit as st
 import sys
-sys.path.insert(0, '/Users/ketankeshav/Documents/GitHub/BuddyBlocks')
+from pathlib import Path
+
+# Add parent directory to path to import utils (once, since Streamlit re-executes this script on every rerun)
+_ROOT = str(Path(__file__).resolve().parents[1])
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from utils.snowflake_client import get_snowflake_client
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_parse_journal(_client, ai_source, journal_text):
+    """Parse a journal entry (cached per AI source and text)"""
+    return _client.parse_journal(journal_text)
+
+
+def fetch_coach_messages(client, task, duration):
+    """Fetch every coach message in one call (not cached, so each click shows fresh wording)"""
+    return client.get_coach_messages({'task': task, 'duration': duration})
+
+
+# Default input for the journal parsing test
+SAMPLE_JOURNAL = "I need to prepare presentation slides and practice my demo. Also review feedback from team."
+
+# Coach message buttons as (label, event) pairs
+COACH_EVENTS = (
+    ("🚀 Session Start", "session_start"),
+    ("⏱️ Halfway", "halfway"),
+    ("☕ Break", "break"),
+    ("🎉 Completion", "completion")
+)
+
+
 def main():
     st.set_page_config(
         page_title="Fallback Test",
@@ -38,7 +66,7 @@ def main():
     with col1:
         journal_text = st.text_area(
             "Enter journal text:",
-            value="I need to prepare presentation slides and practice my demo. Also review feedback from team.",
+            value=SAMPLE_JOURNAL,
             height=100
         )
     
@@ -48,7 +76,7 @@ def main():
         if st.button("🔍 Parse Journal", type="primary", use_container_width=True):
             try:
                 with st.spinner("Parsing journal..."):
-                    tasks = client.parse_journal(journal_text)
+                    tasks = cached_parse_journal(client, client.get_ai_source(), journal_text)
                     
                     st.success(f"✅ Parsed {len(tasks)} tasks")
                     
@@ -67,51 +95,14 @@ def main():
     # Test 2: Coach Messages
     st.header("Test 2: Coach Messages")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        if st.button("🚀 Session Start", use_container_width=True):
-            try:
-                msg = client.get_coach_message('session_start', {
-                    'task': 'Write Report',
-                    'duration': 60
-                })
-                st.info(f"🎙️ {msg}")
-            except Exception as e:
-                st.error(f"❌ {str(e)}")
-    
-    with col2:
-        if st.button("⏱️ Halfway", use_container_width=True):
-            try:
-                msg = client.get_coach_message('halfway', {
-                    'task': 'Write Report',
-                    'duration': 60
-                })
-                st.info(f"🎙️ {msg}")
-            except Exception as e:
-                st.error(f"❌ {str(e)}")
-    
-    with col3:
-        if st.button("☕ Break", use_container_width=True):
-            try:
-                msg = client.get_coach_message('break', {
-                    'task': 'Write Report',
-                    'duration': 60
-                })
-                st.info(f"🎙️ {msg}")
-            except Exception as e:
-                st.error(f"❌ {str(e)}")
-    
-    with col4:
-        if st.button("🎉 Completion", use_container_width=True):
-            try:
-                msg = client.get_coach_message('completion', {
-                    'task': 'Write Report',
-                    'duration': 60
-                })
-                st.info(f"🎙️ {msg}")
-            except Exception as e:
-                st.error(f"❌ {str(e)}")
+    for (label, event), col in zip(COACH_EVENTS, st.columns(len(COACH_EVENTS))):
+        with col:
+            if st.button(label, use_container_width=True):
+                try:
+                    msg = fetch_coach_messages(client, 'Write Report', 60)[event]
+                    st.info(f"🎙️ {msg}")
+                except Exception as e:
+                    st.error(f"❌ {str(e)}")
     
     st.divider()
     
@@ -7,8 +7,10 @@ import streamlit as st
 import sys
 from pathlib import Path
 
-# Add parent directory to path to import utils
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to path to import utils (once, since Streamlit re-executes this script on every rerun)
+_ROOT = str(Path(__file__).resolve().parents[1])
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 from utils.ui_components import (
     show_connection_status,
@@ -18,18 +20,27 @@ from utils.ui_components import (
     show_connection_troubleshooting,
     show_quick_actions
 )
+from _ui_test_harness import MockClient
 
 
-# Mock client for testing
-class MockClient:
-    """Mock Snowflake client for testing UI components"""
-    
-    def __init__(self, connected=True):
-        self.is_connected = connected
-        self.session = None if not connected else "mock_session"
-    
-    def get_ai_source(self):
-        return "Snowflake Cortex AI" if self.is_connected else "Mock AI (Demo Mode)"
+# Instructions shown at the bottom of the page
+INSTRUCTIONS_MD = """
+**Test Instructions:**
+
+1. ✅ Use the sidebar toggle to switch between connected/disconnected states
+2. ✅ Verify all components render correctly
+3. ✅ Check that badges show correct colors and text
+4. ✅ Test expandable sections (Connection Details, Troubleshooting, etc.)
+5. ✅ Click buttons to verify they work (some will show info messages)
+6. ✅ Enable configuration form and test the form inputs
+
+**Expected Results:**
+- Connected state: Green success, purple badge
+- Disconnected state: Yellow warning, orange badge
+- All text should be readable and well-formatted
+- Gradients should look smooth
+- Tables should be properly aligned
+"""
 
 
 def main():
@@ -123,23 +134,7 @@ def main():
     # Summary
     st.success("✅ All UI components rendered successfully!")
     
-    st.info("""
-    **Test Instructions:**
-    
-    1. ✅ Use the sidebar toggle to switch between connected/disconnected states
-    2. ✅ Verify all components render correctly
-    3. ✅ Check that badges show correct colors and text
-    4. ✅ Test expandable sections (Connection Details, Troubleshooting, etc.)
-    5. ✅ Click buttons to verify they work (some will show info messages)
-    6. ✅ Enable configuration form and test the form inputs
-    
-    **Expected Results:**
-    - Connected state: Green success, purple badge
-    - Disconnected state: Yellow warning, orange badge
-    - All text should be readable and well-formatted
-    - Gradients should look smooth
-    - Tables should be properly aligned
-    """)
+    st.info(INSTRUCTIONS_MD)
 
 
 if __name__ == "__main__":
@@ -4,30 +4,53 @@ Complete verification of all components and configuration
 """
 
 import streamlit as st
+import importlib
+import os
 import sys
 from pathlib import Path
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add parent directory to path (once, since Streamlit re-executes this script on every rerun)
+_ROOT = str(Path(__file__).resolve().parents[1])
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# Files checked by CHECK 1, relative to the project root
+FILES_TO_CHECK = (
+    '.streamlit/secrets.toml',
+    'utils/snowflake_client.py',
+    'utils/mock_ai.py',
+    'utils/ui_components.py',
+    'app.py',
+    'requirements.txt'
+)
+
+# Packages checked by CHECK 2 as (module, attribute or None) pairs
+DEPENDENCIES = (
+    ('streamlit', None),
+    ('snowflake.snowpark', 'Session'),
+    ('snowflake.connector', None),
+    ('pandas', None),
+)
+
+# Coach message types exercised by CHECK 6
+COACH_MESSAGE_TYPES = ('session_start', 'halfway', 'break', 'completion')
 
 
 def check_file_exists(filepath: str) -> Tuple[bool, str]:
     """Check if a file exists"""
-    path = Path(filepath)
-    if path.exists():
+    if os.path.isfile(filepath):
         return True, f"✅ {filepath}"
     else:
         return False, f"❌ {filepath} - NOT FOUND"
 
 
-def check_import(module_name: str, import_statement: str = None) -> Tuple[bool, str]:
-    """Check if a module can be imported"""
+def check_import(module_name: str, attribute: Optional[str] = None) -> Tuple[bool, str]:
+    """Check if a module (and optionally one of its attributes) can be imported"""
     try:
-        if import_statement:
-            exec(import_statement)
-        else:
-            __import__(module_name)
+        module = importlib.import_module(module_name)
+        if attribute:
+            getattr(module, attribute)
         return True, f"✅ {module_name}"
     except ImportError as e:
         return False, f"❌ {module_name} - NOT INSTALLED: {str(e)}"
@@ -104,17 +127,8 @@ def main():
     st.header("📁 CHECK 1: Required Files")
     st.caption("Verifying all necessary files are present")
     
-    files_to_check = [
-        '.streamlit/secrets.toml',
-        'utils/snowflake_client.py',
-        'utils/mock_ai.py',
-        'utils/ui_components.py',
-        'app.py',
-        'requirements.txt'
-    ]
-    
     file_results = []
-    for filepath in files_to_check:
+    for filepath in FILES_TO_CHECK:
         total_checks += 1
         success, message = check_file_exists(filepath)
         file_results.append((success, message))
@@ -123,13 +137,8 @@ def main():
     
     # Display file check results
     col1, col2 = st.columns(2)
-    with col1:
-        for i in range(0, len(file_results), 2):
-            st.write(file_results[i][1])
-    with col2:
-        for i in range(1, len(file_results), 2):
-            if i < len(file_results):
-                st.write(file_results[i][1])
+    col1.markdown("\n\n".join(message for _, message in file_results[0::2]))
+    col2.markdown("\n\n".join(message for _, message in file_results[1::2]))
     
     files_passed = all(result[0] for result in file_results)
     if not files_passed:
@@ -144,30 +153,18 @@ def main():
     st.header("📦 CHECK 2: Dependencies Installed")
     st.caption("Verifying Python packages are installed")
     
-    dependencies = [
-        ('streamlit', None),
-        ('snowflake.snowpark', 'from snowflake.snowpark import Session'),
-        ('snowflake.connector', 'import snowflake.connector'),
-        ('pandas', None),
-    ]
-    
     dep_results = []
-    for module_name, import_stmt in dependencies:
+    for module_name, attribute in DEPENDENCIES:
         total_checks += 1
-        success, message = check_import(module_name, import_stmt)
+        success, message = check_import(module_name, attribute)
         dep_results.append((success, message))
         if success:
             passed_checks += 1
     
     # Display dependency check results
     col1, col2 = st.columns(2)
-    with col1:
-        for i in range(0, len(dep_results), 2):
-            st.write(dep_results[i][1])
-    with col2:
-        for i in range(1, len(dep_results), 2):
-            if i < len(dep_results):
-                st.write(dep_results[i][1])
+    col1.markdown("\n\n".join(message for _, message in dep_results[0::2]))
+    col2.markdown("\n\n".join(message for _, message in dep_results[1::2]))
     
     deps_passed = all(result[0] for result in dep_results)
     if not deps_passed:
@@ -194,7 +191,6 @@ def main():
         # Show configured keys (without values)
         with st.expander("🔍 View Configured Keys"):
             try:
-                config = st.secrets["snowflake"]
                 col1, col2 = st.columns(2)
                 with col1:
                     st.write("✅ account")
@@ -221,8 +217,14 @@ def main():
     
     st.divider()
     
+    # Connected once in CHECK 4 and reused by the checks below
+    client = None
+    
     # Only continue with remaining checks if critical checks passed
     if not critical_failed:
+        # Safe to import now that CHECK 1 and CHECK 2 confirmed the client module and its dependencies
+        from utils.snowflake_client import get_snowflake_client
+        
         # CHECK 4: Snowflake Connection
         st.header("🔌 CHECK 4: Snowflake Connection")
         st.caption("Testing connection to Snowflake")
@@ -231,7 +233,6 @@ def main():
         
         try:
             with st.spinner("Connecting to Snowflake..."):
-                from utils.snowflake_client import get_snowflake_client
                 client = get_snowflake_client()
             
             if client and client.is_connected:
@@ -277,7 +278,12 @@ def main():
             st.info("Run `streamlit run tests/test_snowflake_connection.py` for detailed diagnostics")
         
         st.divider()
-        
+    
+    # CHECK 5-7 exercise the client from CHECK 4, so there is nothing to test without it
+    if not critical_failed and client is None:
+        st.header("⏭️ CHECK 5-7: Skipped")
+        st.info("ℹ️ Skipped: no client from CHECK 4 (see the connection error above)")
+    elif not critical_failed:
         # CHECK 5: AI Parsing Test
         st.header("🤖 CHECK 5: AI Parsing Test")
         st.caption("Testing journal parsing functionality")
@@ -288,8 +294,6 @@ def main():
             test_journal = "I need to prepare presentation slides, practice my demo, and review feedback from the team."
             
             with st.spinner("Testing AI parsing..."):
-                from utils.snowflake_client import get_snowflake_client
-                client = get_snowflake_client()
                 tasks = client.parse_journal(test_journal)
             
             if tasks and len(tasks) >= 3:
@@ -317,14 +321,10 @@ def main():
         st.header("🎙️ CHECK 6: Coach Messages Test")
         st.caption("Testing AI coaching functionality")
         
-        message_types = ['session_start', 'halfway', 'break', 'completion']
         coach_results = []
         
         try:
-            from utils.snowflake_client import get_snowflake_client
-            client = get_snowflake_client()
-            
-            for msg_type in message_types:
+            for msg_type in COACH_MESSAGE_TYPES:
                 total_checks += 1
                 try:
                     message = client.get_coach_message(
@@ -367,9 +367,6 @@ def main():
         st.caption("Testing data persistence (requires Snowflake connection)")
         
         try:
-            from utils.snowflake_client import get_snowflake_client
-            client = get_snowflake_client()
-            
             if client and client.is_connected:
                 total_checks += 1
                 
@@ -5,11 +5,30 @@ Parses journal entries into structured tasks
 
 import random
 import re
+from itertools import islice
 from typing import List
 from datetime import datetime
 import uuid
 from utils.models import Task
 
+# Maps every sentence terminator to '.' so a journal entry splits on one character
+SENTENCE_END_TABLE = str.maketrans({'!': '.', '?': '.'})
+
+# Common intent phrases stripped from the start of a task title
+LEADING_INTENT_PATTERN = re.compile(r'^(I need to|I have to|I must|I should|I will|I want to)\s+', re.IGNORECASE)
+
+# Generic subtasks sampled for each mock task
+SUBTASK_TEMPLATES = (
+    "Research and gather information",
+    "Create initial draft or outline",
+    "Review and refine content",
+    "Get feedback from stakeholders",
+    "Make final revisions",
+    "Prepare supporting materials",
+    "Schedule follow-up meeting",
+    "Document findings and results"
+)
+
 
 def parse_journal_mock(journal_text: str) -> List[Task]:
     """
@@ -24,24 +43,23 @@ def parse_journal_mock(journal_text: str) -> List[Task]:
     if not journal_text or not journal_text.strip():
         return []
     
-    # Split text into sentences
-    sentences = re.split(r'[.!?]+', journal_text)
-    sentences = [s.strip() for s in sentences if s.strip() and len(s.strip()) > 10]
-    
-    # Limit to 3-5 tasks
-    num_tasks = min(len(sentences), random.randint(3, 5))
-    selected_sentences = sentences[:num_tasks]
+    # Split text into sentences, keeping only the first 3-5 usable ones
+    sentences = journal_text.translate(SENTENCE_END_TABLE).split('.')
+    num_tasks = random.randint(3, 5)
+    selected_sentences = list(islice((s for s in (s.strip() for s in sentences) if len(s) > 10), num_tasks))
     
+    # Every task from one journal entry shares its creation time
+    created_at = datetime.now()
     tasks = []
     
     for sentence in selected_sentences:
-        # Extract title (first 5-7 words)
-        words = sentence.split()
+        # Extract title (first 5-7 words); splitting stops after 7, leaving the rest in one piece
+        words = sentence.split(None, 7)
         title_length = min(len(words), random.randint(5, 7))
         title = ' '.join(words[:title_length])
         
         # Clean up title (remove common starting words)
-        title = re.sub(r'^(I need to|I have to|I must|I should|I will|I want to)\s+', '', title, flags=re.IGNORECASE)
+        title = LEADING_INTENT_PATTERN.sub('', title)
         title = title.capitalize()
         if not title.endswith('...') and len(words) > title_length:
             title += '...'
@@ -54,17 +72,7 @@ def parse_journal_mock(journal_text: str) -> List[Task]:
         
         # Generate 2-4 subtasks
         num_subtasks = random.randint(2, 4)
-        subtask_templates = [
-            "Research and gather information",
-            "Create initial draft or outline",
-            "Review and refine content",
-            "Get feedback from stakeholders",
-            "Make final revisions",
-            "Prepare supporting materials",
-            "Schedule follow-up meeting",
-            "Document findings and results"
-        ]
-        subtasks = random.sample(subtask_templates, min(num_subtasks, len(subtask_templates)))
+        subtasks = random.sample(SUBTASK_TEMPLATES, min(num_subtasks, len(SUBTASK_TEMPLATES)))
         
         # Random priority score (40-80)
         priority_score = round(random.uniform(40, 80), 1)
@@ -78,7 +86,7 @@ def parse_journal_mock(journal_text: str) -> List[Task]:
             subtasks=subtasks,
             status="pending",
             priority_score=priority_score,
-            created_at=datetime.now()
+            created_at=created_at
         )
         
         tasks.append(task)
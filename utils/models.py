@@ -4,10 +4,15 @@ Data models for Focus Flow
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
+import html
 import uuid
+import numpy as np
 import streamlit as st
 
+# Task statuses stored as small integers in the task arrays
+STATUS_CODES = {"pending": 0, "in_progress": 1, "completed": 2}
+
 
 @dataclass
 class Task:
@@ -20,6 +25,30 @@ class Task:
     status: str = "pending"  # pending/in_progress/completed
     priority_score: float = 50.0  # 0-100
     created_at: datetime = field(default_factory=datetime.now)
+    card_html: Optional[str] = field(default=None, repr=False, compare=False)  # Rendered grid card, reset on status change
+    
+    def __post_init__(self):
+        # AI JSON may carry nulls or non-string items, so coerce the text fields first
+        self.title = str(self.title or "")
+        self.description = str(self.description or "")
+        self.subtasks = [str(subtask) for subtask in self.subtasks or [] if subtask is not None]
+        
+        # Escape user text once for the HTML task cards
+        self._title_html = html.escape(self.title)
+        self._desc_html = html.escape(self.description)
+        self._subtasks_html = tuple(html.escape(subtask) for subtask in self.subtasks)
+    
+    def to_record(self) -> Dict:
+        """Row dict for SnowflakeClient.save_task"""
+        return {
+            'task_id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'estimated_duration': self.estimated_duration,
+            'subtasks': self.subtasks,
+            'status': self.status,
+            'priority_score': self.priority_score
+        }
 
 
 @dataclass
@@ -32,6 +61,37 @@ class WorkSession:
     completed: bool = False
 
 
+class TaskTable:
+    """Sort/filter columns for the session's tasks, one row per task in list order"""
+    
+    def __init__(self):
+        self.priority = np.empty(0, np.float32)
+        self.duration = np.empty(0, np.int32)
+        self.created = np.empty(0, np.float64)  # POSIX timestamps
+        self.status = np.empty(0, np.uint8)  # STATUS_CODES values
+        self.title_key = np.empty(0, np.str_)  # Lowercased titles
+        self.rows = {}  # Task id -> row
+    
+    def __len__(self):
+        return len(self.status)
+    
+    def append(self, tasks: List[Task]):
+        """Add one row per task, appending each column in a single batch (all or nothing)"""
+        # Build every new column first so a bad task leaves the table untouched
+        priority = np.concatenate([self.priority, np.array([t.priority_score for t in tasks], np.float32)])
+        duration = np.concatenate([self.duration, np.array([t.estimated_duration for t in tasks], np.int32)])
+        created = np.concatenate([self.created, np.array([t.created_at.timestamp() for t in tasks], np.float64)])
+        status = np.concatenate([self.status, np.array([STATUS_CODES[t.status] for t in tasks], np.uint8)])
+        title_key = np.concatenate([self.title_key, np.array([t.title.lower() for t in tasks], np.str_)])
+        
+        self.rows.update((task.id, row) for row, task in enumerate(tasks, len(self)))
+        self.priority, self.duration, self.created, self.status, self.title_key = priority, duration, created, status, title_key
+    
+    def set_status(self, task_id: str, status: str):
+        """Update the status code in a task's row"""
+        self.status[self.rows[task_id]] = STATUS_CODES[status]
+
+
 def initialize_session_state():
     """Initialize session state variables for the app"""
     
@@ -42,12 +102,23 @@ def initialize_session_state():
         st.session_state.break_duration = 15
     if 'voice_coach' not in st.session_state:
         st.session_state.voice_coach = True
+    if 'celebrate' not in st.session_state:
+        st.session_state.celebrate = True  # Balloons when a focus session ends
     
     # Task management
     if 'tasks' not in st.session_state:
         st.session_state.tasks = []
     if 'current_task' not in st.session_state:
         st.session_state.current_task = None
+    if 'task_table' not in st.session_state:
+        st.session_state.task_table = TaskTable()  # Sort/filter columns kept parallel to the tasks list
+    if 'tasks_version' not in st.session_state:
+        st.session_state.tasks_version = 0  # Bumped whenever tasks are added or change status
+    if 'task_views' not in st.session_state:
+        st.session_state.task_views = {}  # (sort, filter) -> task rows, for the current tasks_version
+        st.session_state.task_views_version = 0
+    if 'status_counts' not in st.session_state:
+        st.session_state.status_counts = dict.fromkeys(STATUS_CODES, 0)
     
     # Timer and session tracking
     if 'timer_running' not in st.session_state:
@@ -56,9 +127,47 @@ def initialize_session_state():
         st.session_state.time_remaining = 0
     if 'session_start' not in st.session_state:
         st.session_state.session_start = None
+    if 'pending_saves' not in st.session_state:
+        st.session_state.pending_saves = []  # Futures for task saves still running in the background
     
     # Statistics
     if 'completed_sessions' not in st.session_state:
         st.session_state.completed_sessions = 0
     if 'total_focus_time' not in st.session_state:
         st.session_state.total_focus_time = 0
+    if 'total_focus_time_str' not in st.session_state:
+        st.session_state.total_focus_time_str = "0m"  # Display form, refreshed when total_focus_time changes
+
+
+def normalize_status(status) -> str:
+    """Map a status from AI or stored data onto STATUS_CODES, treating anything unknown as pending"""
+    return status if isinstance(status, str) and status in STATUS_CODES else "pending"
+
+
+def add_tasks(tasks: List[Task]):
+    """Add new tasks to the session"""
+    for task in tasks:
+        task.status = normalize_status(task.status)
+    
+    # Append to the table first: it fails without side effects, so the list is only extended on success
+    st.session_state.task_table.append(tasks)
+    st.session_state.tasks.extend(tasks)
+    
+    for task in tasks:
+        st.session_state.status_counts[task.status] += 1
+    
+    st.session_state.tasks_version += 1
+
+
+def set_task_status(task: Task, status: str):
+    """Change the status of a task in the session"""
+    if status not in STATUS_CODES:
+        raise ValueError(f"Unknown task status: {status}")
+    
+    st.session_state.status_counts[task.status] -= 1
+    st.session_state.status_counts[status] += 1
+    
+    task.status = status
+    task.card_html = None
+    st.session_state.task_table.set_status(task.id, status)
+    st.session_state.tasks_version += 1
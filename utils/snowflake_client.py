@@ -9,6 +9,9 @@ import re
 from typing import List, Dict, Optional
 from datetime import datetime
 
+# Markdown code fence around an AI JSON response, e.g. ```json ... ```
+CODE_FENCE_PATTERN = re.compile(r"^\s*```(?:json)?|```\s*$")
+
 
 class SnowflakeClient:
     """
@@ -51,7 +54,9 @@ class SnowflakeClient:
                 "role": config['role'],
                 "warehouse": config['warehouse'],
                 "database": config['database'],
-                "schema": config['schema']
+                "schema": config['schema'],
+                # The session is cached for the life of the app, so keep it from expiring while idle
+                "client_session_keep_alive": True
             }
             
             # Create Snowpark session
@@ -114,19 +119,28 @@ class SnowflakeClient:
         Returns:
             str: Cleaned JSON string
         """
-        # Remove markdown code blocks if present
-        if response.startswith("```json"):
-            response = response[7:]
-        elif response.startswith("```"):
-            response = response[3:]
-        
-        if response.endswith("```"):
-            response = response[:-3]
+        # Remove markdown code fences (if present) and surrounding whitespace
+        return CODE_FENCE_PATTERN.sub("", response).strip()
+    
+    def _coach_prompts(self, context: Dict) -> Dict[str, str]:
+        """
+        Build the Cortex prompt for each coach message type
         
-        # Strip whitespace
-        response = response.strip()
+        Args:
+            context: Dictionary with 'task' and 'duration' keys
+            
+        Returns:
+            Dict[str, str]: Prompt keyed by message type
+        """
+        task_name = context.get('task', 'this task')
+        duration = context.get('duration', 90)
         
-        return response
+        return {
+            'session_start': f"You're starting a {duration}-minute focus session on '{task_name}'. Give an encouraging 15-word message to begin.",
+            'halfway': f"You're halfway through your focus session on '{task_name}'. Give a motivating 15-word check-in message.",
+            'break': f"You just completed a focus session. Suggest a healthy 15-word break activity.",
+            'completion': f"You completed '{task_name}'! Give a celebratory 15-word message recognizing the achievement."
+        }
     
     def _escape_sql_string(self, text: str) -> str:
         """
@@ -166,8 +180,33 @@ class SnowflakeClient:
         # Try Snowflake Cortex AI first
         if self.is_connected and self.session is not None:
             try:
-                # Build the exact prompt
-                prompt = f"""Parse this journal entry into 3-5 actionable tasks.
+                return self.parse_journal_cortex(journal_text)
+            except Exception as e:
+                # Log the error but continue with fallback
+                print(f"Snowflake Cortex AI error: {str(e)}")
+                # Fall through to mock AI
+        
+        return self.parse_journal_fallback(journal_text)
+    
+    def parse_journal_cortex(self, journal_text: str) -> List[Dict]:
+        """
+        Parse journal entry into structured tasks using Cortex AI only
+        
+        Makes no Streamlit calls, so it is safe to run on a background thread.
+        
+        Args:
+            journal_text: Raw journal entry text
+        
+        Returns:
+            List[Dict]: List of parsed task dictionaries
+        
+        Raises:
+            Exception: If not connected or Cortex returns no valid JSON array
+        """
+        self._ensure_connected()
+        
+        # Build the exact prompt
+        prompt = f"""Parse this journal entry into 3-5 actionable tasks.
 
 Return ONLY a valid JSON array with this exact structure:
 [
@@ -185,43 +224,49 @@ Rules:
 - Return ONLY the JSON array, no markdown, no explanation
 
 Journal entry: {journal_text}"""
-                
-                # Escape single quotes for SQL
-                prompt_escaped = self._escape_sql_string(prompt)
-                
-                # Execute Cortex AI query
-                query = f"""
-                SELECT SNOWFLAKE.CORTEX.COMPLETE(
-                    'mistral-large',
-                    '{prompt_escaped}'
-                ) as response
-                """
-                
-                result = self.session.sql(query).collect()
-                
-                if not result or not result[0]['RESPONSE']:
-                    raise Exception("Empty response from Cortex AI")
-                
-                raw_response = result[0]['RESPONSE']
-                
-                # Clean the response
-                cleaned_response = self._clean_json_response(raw_response)
-                
-                # Parse as JSON
-                parsed_tasks = json.loads(cleaned_response)
-                
-                # Validate it's a list
-                if not isinstance(parsed_tasks, list):
-                    raise Exception("AI response is not a valid JSON array")
-                
-                return parsed_tasks
-                
-            except Exception as e:
-                # Log the error but continue with fallback
-                print(f"Snowflake Cortex AI error: {str(e)}")
-                # Fall through to mock AI
         
-        # Fallback to mock AI
+        # Escape single quotes for SQL
+        prompt_escaped = self._escape_sql_string(prompt)
+        
+        # Execute Cortex AI query
+        query = f"""
+        SELECT SNOWFLAKE.CORTEX.COMPLETE(
+            'mistral-large',
+            '{prompt_escaped}'
+        ) as response
+        """
+        
+        result = self.session.sql(query).collect()
+        
+        if not result or not result[0]['RESPONSE']:
+            raise Exception("Empty response from Cortex AI")
+        
+        raw_response = result[0]['RESPONSE']
+        
+        # Clean the response
+        cleaned_response = self._clean_json_response(raw_response)
+        
+        # Parse as JSON
+        parsed_tasks = json.loads(cleaned_response)
+        
+        # Validate it's a list
+        if not isinstance(parsed_tasks, list):
+            raise Exception("AI response is not a valid JSON array")
+        
+        return parsed_tasks
+    
+    def parse_journal_fallback(self, journal_text: str) -> List[Dict]:
+        """
+        Parse journal entry with mock AI, warning the user that Cortex was not used
+        
+        Must run on the Streamlit script thread so the warning is shown.
+        
+        Args:
+            journal_text: Raw journal entry text
+        
+        Returns:
+            List[Dict]: List of parsed task dictionaries
+        """
         try:
             from utils.mock_ai import parse_journal_mock
             
@@ -250,19 +295,8 @@ Journal entry: {journal_text}"""
         # Try Snowflake Cortex AI first
         if self.is_connected and self.session is not None:
             try:
-                # Get context values
-                task_name = context.get('task', 'this task')
-                duration = context.get('duration', 90)
-                
-                # Define prompts for different message types
-                prompts = {
-                    'session_start': f"You're starting a {duration}-minute focus session on '{task_name}'. Give an encouraging 15-word message to begin.",
-                    'halfway': f"You're halfway through your focus session on '{task_name}'. Give a motivating 15-word check-in message.",
-                    'break': f"You just completed a focus session. Suggest a healthy 15-word break activity.",
-                    'completion': f"You completed '{task_name}'! Give a celebratory 15-word message recognizing the achievement."
-                }
-                
                 # Get prompt for message type
+                prompts = self._coach_prompts(context)
                 prompt = prompts.get(message_type, "Give an encouraging 15-word message about staying focused.")
                 
                 # Escape single quotes for SQL
@@ -310,6 +344,68 @@ Journal entry: {journal_text}"""
             }
             return fallback_messages.get(message_type, "Keep up the great work!")
     
+    def get_coach_messages(self, context: Dict = {}) -> Dict[str, str]:
+        """
+        Get coaching messages for every session event with a single Cortex call
+        Falls back to mock AI for any message Cortex does not return
+        
+        Args:
+            context: Dictionary with 'task' and 'duration' keys
+            
+        Returns:
+            Dict[str, str]: Coaching message keyed by message type
+        """
+        prompts = self._coach_prompts(context)
+        messages = {}
+        
+        # Try Snowflake Cortex AI first
+        if self.is_connected and self.session is not None:
+            try:
+                instructions = "\n".join(f"- {key}: {prompt}" for key, prompt in prompts.items())
+                prompt = f"""Write one coaching message for each key below, following its instruction.
+
+Return ONLY a valid JSON object mapping each key to its message, no markdown, no explanation.
+
+{instructions}"""
+                
+                # Escape single quotes for SQL
+                prompt_escaped = self._escape_sql_string(prompt)
+                
+                # Execute Cortex AI query
+                query = f"""
+                SELECT SNOWFLAKE.CORTEX.COMPLETE(
+                    'mistral-large',
+                    '{prompt_escaped}'
+                ) as response
+                """
+                
+                result = self.session.sql(query).collect()
+                
+                if not result or not result[0]['RESPONSE']:
+                    raise Exception("Empty response from Cortex AI")
+                
+                parsed = json.loads(self._clean_json_response(result[0]['RESPONSE']))
+                
+                if not isinstance(parsed, dict):
+                    raise Exception("AI response is not a valid JSON object")
+                
+                messages = {
+                    key: str(parsed[key]).strip().strip('"').strip("'")
+                    for key in prompts if parsed.get(key)
+                }
+                
+            except Exception as e:
+                # Log error but continue with fallback (silently)
+                print(f"Snowflake Cortex AI error: {str(e)}")
+        
+        # Fill anything missing from mock AI
+        from utils.mock_ai import get_coach_message_mock
+        for key in prompts:
+            if key not in messages:
+                messages[key] = get_coach_message_mock(key, context)
+        
+        return messages
+    
     def save_task(self, task: Dict) -> str:
         """
         Save a task to the Snowflake database
@@ -405,38 +501,88 @@ Journal entry: {journal_text}"""
             result = self.session.sql(query).collect()
             
             # Convert to list of dictionaries
-            tasks = []
-            for row in result:
-                task = {
-                    'task_id': row['TASK_ID'],
-                    'title': row['TITLE'],
-                    'description': row['DESCRIPTION'],
-                    'estimated_duration': row['ESTIMATED_DURATION'],
-                    'status': row['STATUS'],
-                    'priority_score': row['PRIORITY_SCORE'],
-                    'created_at': row['CREATED_AT']
-                }
-                
-                # Parse subtasks JSON field
-                try:
-                    if row['SUBTASKS']:
-                        # Handle if subtasks is already parsed or is a string
-                        if isinstance(row['SUBTASKS'], str):
-                            task['subtasks'] = json.loads(row['SUBTASKS'])
-                        else:
-                            task['subtasks'] = row['SUBTASKS']
-                    else:
-                        task['subtasks'] = []
-                except (json.JSONDecodeError, TypeError):
-                    task['subtasks'] = []
-                
-                tasks.append(task)
+            return [self._row_to_task(row) for row in result]
+            
+        except Exception as e:
+            raise Exception(f"Failed to retrieve tasks: {str(e)}")
+    
+    def get_recent_tasks(self, limit: int = 10, status: Optional[str] = None) -> List[Dict]:
+        """
+        Retrieve the most recently created tasks, sorted and limited in SQL
+        
+        Args:
+            limit: Maximum number of tasks to return
+            status: Only return tasks with this status (all statuses if None)
+            
+        Returns:
+            List[Dict]: List of task dictionaries, newest first
+            
+        Raises:
+            Exception: If not connected or query fails
+        """
+        self._ensure_connected()
+        
+        try:
+            where_clause = f"WHERE status = '{self._escape_sql_string(status)}'" if status else ""
+            
+            query = f"""
+            SELECT 
+                task_id,
+                title,
+                description,
+                estimated_duration,
+                subtasks,
+                status,
+                priority_score,
+                created_at
+            FROM tasks
+            {where_clause}
+            ORDER BY created_at DESC
+            LIMIT {int(limit)}
+            """
             
-            return tasks
+            result = self.session.sql(query).collect()
+            
+            return [self._row_to_task(row) for row in result]
             
         except Exception as e:
             raise Exception(f"Failed to retrieve tasks: {str(e)}")
     
+    def _row_to_task(self, row) -> Dict:
+        """
+        Convert a tasks table row into a task dictionary
+        
+        Args:
+            row: Snowpark Row from a query selecting the task columns
+            
+        Returns:
+            Dict: Task dictionary with subtasks parsed from JSON
+        """
+        task = {
+            'task_id': row['TASK_ID'],
+            'title': row['TITLE'],
+            'description': row['DESCRIPTION'],
+            'estimated_duration': row['ESTIMATED_DURATION'],
+            'status': row['STATUS'],
+            'priority_score': row['PRIORITY_SCORE'],
+            'created_at': row['CREATED_AT']
+        }
+        
+        # Parse subtasks JSON field
+        try:
+            if row['SUBTASKS']:
+                # Handle if subtasks is already parsed or is a string
+                if isinstance(row['SUBTASKS'], str):
+                    task['subtasks'] = json.loads(row['SUBTASKS'])
+                else:
+                    task['subtasks'] = row['SUBTASKS']
+            else:
+                task['subtasks'] = []
+        except (json.JSONDecodeError, TypeError):
+            task['subtasks'] = []
+        
+        return task
+    
     def update_task_status(self, task_id: str, status: str) -> str:
         """
         Update the status of a task
@@ -571,7 +717,7 @@ Journal entry: {journal_text}"""
             print(f"Warning: Error closing Snowflake session: {str(e)}")
 
 
-@st.cache_resource
+@st.cache_resource(show_spinner="Initializing Snowflake connection...")
 def get_snowflake_client() -> SnowflakeClient:
     """
     Get or create a cached Snowflake client singleton
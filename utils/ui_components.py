@@ -3,8 +3,9 @@ Reusable UI Components for Focus Flow
 Streamlit components for connection status, badges, and configuration
 """
 
+import html
 import streamlit as st
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict, Sequence, Tuple
 from pathlib import Path
 
 
@@ -555,6 +556,145 @@ def show_quick_actions(client) -> None:
             st.info("Check out README.md for detailed documentation")
 
 
+def show_metric_tiles(items: Sequence[Tuple], columns: int) -> None:
+    """
+    Display a row or grid of metric tiles as a single HTML block
+    
+    Renders all tiles in one markdown element instead of one st.metric per
+    value inside st.columns, which keeps the element count per rerun low.
+    
+    Args:
+        items: (label, value) or (label, value, help) tuples, in row-major order
+        columns: Number of tiles per row
+    
+    Example:
+        >>> show_metric_tiles([("Tasks Done", 3), ("Total Time", "1h 30m", "Focus time today")], columns=2)
+    """
+    
+    tiles = []
+    for label, value, *help_text in items:
+        # Escape every field: st.metric showed them as plain text, not HTML
+        title = f" title='{html.escape(str(help_text[0]))}'" if help_text else ""
+        tiles.append(
+            f"<div{title} style='padding: 4px 0;'>"
+            f"<div style='font-size: 14px; color: #808495;'>{html.escape(str(label))}</div>"
+            f"<div style='font-size: 1.75rem; line-height: 1.4;'>{html.escape(str(value))}</div>"
+            "</div>"
+        )
+    
+    st.markdown(
+        f"<div style='display: grid; grid-template-columns: repeat({columns}, 1fr); gap: 12px; margin-bottom: 1rem;'>"
+        + "".join(tiles)
+        + "</div>",
+        unsafe_allow_html=True
+    )
+
+
+FOCUS_TIMER_HTML = """
+<div class="focus-timer"></div>
+<div class="focus-track"><div class="focus-progress"></div></div>
+<div class="focus-progress-label"></div>
+"""
+
+FOCUS_TIMER_CSS = """
+.focus-timer { text-align: center; margin: 20px 0; font-size: 72px; font-weight: bold; color: #667eea; font-family: monospace; }
+.focus-track { height: 8px; border-radius: 4px; background: #e6e9f0; overflow: hidden; }
+.focus-progress { height: 100%; background: #667eea; }
+.focus-progress-label { margin-top: 6px; font-size: 14px; color: #808495; font-family: sans-serif; }
+"""
+
+FOCUS_TIMER_JS = """
+export default function (component) {
+    const { data, parentElement, setTriggerValue } = component;
+    const timer = parentElement.querySelector(".focus-timer");
+    const bar = parentElement.querySelector(".focus-progress");
+    const label = parentElement.querySelector(".focus-progress-label");
+    const end = Date.now() + data.remaining * 1000;
+    const checkpoints = data.running ? [...data.checkpoints] : [];
+    const pad = (n) => String(n).padStart(2, "0");
+    
+    const render = () => {
+        const msLeft = Math.max(0, end - Date.now());
+        const left = Math.round(msLeft / 1000);
+        const progress = data.total > 0 ? Math.min(1, Math.max(0, 1 - msLeft / 1000 / data.total)) : 1;
+        timer.textContent = pad(Math.floor(left / 60)) + ":" + pad(left % 60);
+        bar.style.width = (progress * 100) + "%";
+        label.textContent = "Progress: " + (progress * 100).toFixed(1) + "%";
+        
+        // Hand each checkpoint to Python once the countdown reaches it
+        if (checkpoints.length && msLeft <= checkpoints[0] * 1000) {
+            setTriggerValue("checkpoint", checkpoints.shift());
+        }
+        return msLeft;
+    };
+    
+    const stop = () => {
+        clearInterval(parentElement.focusTimerHandle);
+        document.removeEventListener("visibilitychange", parentElement.focusTimerOnShow);
+    };
+    
+    stop();
+    render();
+    if (data.running) {
+        // Skip ticks while the page is hidden; catch up as soon as it is shown
+        parentElement.focusTimerHandle = setInterval(() => {
+            if (!document.hidden && render() <= 0 && !checkpoints.length) stop();
+        }, 1000);
+        parentElement.focusTimerOnShow = () => {
+            if (!document.hidden) render();
+        };
+        document.addEventListener("visibilitychange", parentElement.focusTimerOnShow);
+    }
+    return stop;
+}
+"""
+
+_focus_timer = st.components.v2.component(
+    "focus_timer",
+    html=FOCUS_TIMER_HTML,
+    css=FOCUS_TIMER_CSS,
+    js=FOCUS_TIMER_JS
+)
+
+
+def focus_timer_component(
+    seconds_remaining: float,
+    running: bool,
+    total_seconds: float,
+    checkpoints: Sequence[float] = (),
+    on_checkpoint: Optional[Callable[[], None]] = None
+) -> None:
+    """
+    Display the focus session countdown and progress bar, ticking in the browser
+    
+    The countdown and progress are updated client-side every second, so a
+    running timer needs no server reruns. The browser only calls back into
+    Python when the countdown reaches one of the checkpoints, and holds those
+    calls while the page is hidden.
+    
+    Args:
+        seconds_remaining: Seconds left on the timer when rendered
+        running: Whether the countdown should tick or stay frozen (paused)
+        total_seconds: Full length of the session, used for the progress bar
+        checkpoints: Seconds-left marks, in descending order, that trigger a rerun
+        on_checkpoint: Optional callback run when a checkpoint is reached
+    
+    Example:
+        >>> focus_timer_component(20 * 60, running=True, total_seconds=25 * 60, checkpoints=[0])
+    """
+    
+    _focus_timer(
+        key="focus_timer",
+        data={
+            "remaining": max(0, seconds_remaining),
+            "running": running,
+            "total": total_seconds,
+            "checkpoints": list(checkpoints)
+        },
+        on_checkpoint_change=on_checkpoint or (lambda: None)
+    )
+
+
 # Example usage in main app
 if __name__ == "__main__":
     st.set_page_config(page_title="UI Components Demo", page_icon="🎨", layout="wide")